@@ -1,10 +1,11 @@
 import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import hashlib
 from cryptography.fernet import Fernet
+from functools import lru_cache
 import os
 from dotenv import load_dotenv
 
@@ -25,7 +26,7 @@ fernet = Fernet(ENCRYPTION_KEY.encode())
 # --- JWT functions ---
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
+    expire = datetime.now(timezone.utc) + timedelta(hours=settings.JWT_EXPIRATION_HOURS)
     to_encode.update({"exp": expire})
     
     encoded_jwt = jwt.encode(
@@ -74,5 +75,8 @@ def authenticate_user(username: str, password: str) -> Optional[dict]:
 def encrypt_token(token: str) -> str:
     return fernet.encrypt(token.encode()).decode()
 
+# Chaque chiffrement Fernet produit un ciphertext unique (IV aléatoire) : un token
+# modifié a donc une nouvelle clé de cache et une entrée périmée n'est jamais relue.
+@lru_cache(maxsize=1024)
 def decrypt_token(encrypted_token: str) -> str:
     return fernet.decrypt(encrypted_token.encode()).decode()
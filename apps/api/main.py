@@ -9,7 +9,7 @@ from routers import health, scans, findings, repositories, webhooks
 from routers import dashboard
 from core.config import settings
 from core.security import verify_token
-from storage.db import init_db
+from storage.db import init_db, close_db_pool
 from services.scheduler import scheduler_service
 
 security = HTTPBearer()
@@ -31,6 +31,8 @@ async def lifespan(app: FastAPI):
         scheduler_service.stop()
         scheduler_service.running = False
 
+    await close_db_pool()
+
 app = FastAPI(
     title="SecretHawk API",
     description="Production-ready secret scanner API",
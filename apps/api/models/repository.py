@@ -30,6 +30,21 @@ class Repository(BaseModel):
     class Config:
         use_enum_values = True
 
+class RepositorySummary(BaseModel):
+    """Token-free projection of a repository for list views"""
+    id: str
+    name: str
+    url: str
+    provider: RepositoryProvider
+    status: RepositoryStatus
+    last_scan: Optional[datetime] = None
+    last_scan_status: Optional[str] = None
+    findings_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        use_enum_values = True
+
 class RepositoryCreate(BaseModel):
     url: HttpUrl
     provider: RepositoryProvider
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List
 from storage.repositories import scan_repository, finding_repository, repository_repository
 from core.security import verify_token
@@ -18,7 +18,7 @@ async def get_dashboard_stats(current_user: dict = Depends(verify_token)) -> Dic
         critical_findings = await finding_repository.count_by_severity("critical")
         
         # Get completed scans in last 30 days
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
         completed_scans = await scan_repository.count_completed_since(thirty_days_ago)
         
         return {
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Query, HTTPException
 from typing import Dict, Any, List, Optional
+import base64
 import csv
 import io
+import json
 
 from models.finding import Finding
 from storage.repositories import finding_repository
@@ -9,18 +11,35 @@ from services.redact import redact_secret
 
 router = APIRouter(tags=["Findings"], prefix="/findings")
 
+def _encode_cursor(cursor) -> Optional[str]:
+    """Opaque, URL-safe form of a keyset pagination cursor"""
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(list(cursor)).encode()).decode()
+
+def _decode_cursor(token: str):
+    try:
+        severity, created_at, finding_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return (str(severity), str(created_at), str(finding_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/")
 async def get_findings(
     job_id: str = Query(...),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     severity: Optional[str] = Query(None),
-    secret_type: Optional[str] = Query(None)
+    secret_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None)
 ) -> Dict[str, Any]:
     """Get paginated findings for a scan job"""
     
-    findings = await finding_repository.get_by_job_id(
+    # Le curseur (page suivante) évite l'OFFSET ; page reste utilisable pour les sauts
+    after = _decode_cursor(cursor) if cursor else None
+    findings, next_cursor = await finding_repository.get_by_job_id(
         job_id=job_id,
+        after=after,
         page=page,
         size=size,
         severity=severity,
@@ -42,7 +61,8 @@ async def get_findings(
             "page": page,
             "size": size,
             "total": total,
-            "pages": (total + size - 1) // size
+            "pages": (total + size - 1) // size,
+            "next_cursor": _encode_cursor(next_cursor)
         }
     }
 
@@ -50,7 +70,8 @@ async def get_findings(
 async def export_findings(job_id: str, format: str = Query("json")) -> Dict[str, Any]:
     """Export findings in various formats"""
     
-    findings = await finding_repository.get_all_by_job_id(job_id)
+    # Les findings sont lus en flux depuis le curseur SQLite
+    findings = finding_repository.iter_by_job_id(job_id)
     
     if format == "csv":
         output = io.StringIO()
@@ -63,7 +84,7 @@ async def export_findings(job_id: str, format: str = Query("json")) -> Dict[str,
         ])
         
         # Write data
-        for finding in findings:
+        async for finding in findings:
             writer.writerow([
                 finding.file_path,
                 finding.line_number,
@@ -82,7 +103,7 @@ async def export_findings(job_id: str, format: str = Query("json")) -> Dict[str,
     
     else:  # JSON format
         redacted_findings = []
-        for finding in findings:
+        async for finding in findings:
             finding_dict = finding.dict()
             finding_dict["secret"] = redact_secret(finding.secret)
             redacted_findings.append(finding_dict)
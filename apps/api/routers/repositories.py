@@ -1,10 +1,10 @@
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from typing import List, Dict, Any
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
 from models.repository import Repository, RepositoryCreate, RepositoryUpdate
-from storage.repositories import repository_repository
+from storage.repositories import repository_repository, new_id
 from services.git_provider import git_provider_service
 from services.repository_scanner import repository_scanner
 from core.security import verify_token
@@ -19,14 +19,14 @@ async def create_repository(
 ) -> Dict[str, Any]:
     
     repository = Repository(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         url=repo_data.url,
         provider=repo_data.provider,
         name=repo_data.name,
         token=repo_data.token,
         discord_webhook_url=repo_data.discord_webhook_url,
         webhook_secret=str(uuid.uuid4()),
-        created_at=datetime.utcnow()
+        created_at=datetime.now(timezone.utc)
     )
     
     if not await git_provider_service.test_repository_access(repository):
@@ -46,7 +46,7 @@ async def create_repository(
 
 @router.get("/")
 async def list_repositories(token: dict = Depends(verify_token)) -> List[Dict[str, Any]]:
-    repositories = await repository_repository.get_all()
+    repositories = await repository_repository.list_summaries()
     
     return [
         {
@@ -1,15 +1,14 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks
 from typing import Dict, Any
-import uuid
 import os
 import zipfile
 import tempfile
-from datetime import datetime
+from datetime import datetime, timezone
 import shutil
 
 from services.runner import ScanRunner
 from models.scan import ScanJob, ScanStatus
-from storage.repositories import scan_repository
+from storage.repositories import scan_repository, new_id
 
 router = APIRouter(tags=["Scans"], prefix="/scans")
 
@@ -35,12 +34,12 @@ async def create_scan(
         )
     
     # Create scan job
-    job_id = str(uuid.uuid4())
+    job_id = new_id()
     scan_job = ScanJob(
         id=job_id,
         filename=file.filename,
         status=ScanStatus.PENDING,
-        created_at=datetime.utcnow()
+        created_at=datetime.now(timezone.utc)
     )
     await scan_repository.create(scan_job)
     
@@ -157,7 +156,7 @@ async def run_scan_job(job_id: str, file_path: str):
         from storage.repositories import finding_repository
         for finding in findings:
             finding.job_id = job_id
-            await finding_repository.create(finding)
+        await finding_repository.bulk_create(findings)
         
         # Update scan completion status
         await scan_repository.update_completion(job_id, ScanStatus.COMPLETED, len(findings))
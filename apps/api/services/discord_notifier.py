@@ -1,7 +1,7 @@
 import aiohttp
 import json
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from models.finding import Finding
 from models.repository import Repository
@@ -72,7 +72,7 @@ class DiscordNotifier:
             embed = {
                 "title": f"🔍 Scan Complete: {repository.name}",
                 "color": color,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
                 "fields": [
                     {
                         "name": "📊 Summary",
@@ -187,7 +187,7 @@ class DiscordNotifier:
             "description": f"**{len(findings)} security issues** detected in recent scan",
             "color": color,
             "fields": fields,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "footer": {
                 "text": "SecretHawk Security Scanner • Take immediate action",
                 "icon_url": "https://cdn.discordapp.com/attachments/placeholder/secrethawk-icon.png"
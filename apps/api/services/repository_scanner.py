@@ -1,10 +1,9 @@
-import uuid
 import tempfile
 import shutil
 import os
 import subprocess
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 
 from models.repository import Repository, RepositoryStatus
@@ -13,7 +12,7 @@ from models.finding import Finding
 from services.git_provider import git_provider_service
 from services.discord_notifier import discord_notifier
 from services.runner import ScanRunner  # Import du scanner complet
-from storage.repositories import repository_repository, scan_repository, finding_repository
+from storage.repositories import repository_repository, scan_repository, finding_repository, new_id
 
 
 class RepositoryScanner:
@@ -41,15 +40,15 @@ class RepositoryScanner:
             await repository_repository.update_scan_status(
                 repository_id,
                 "running",
-                datetime.utcnow()
+                datetime.now(timezone.utc)
             )
 
             # Create scan job
             scan_job = ScanJob(
-                id=str(uuid.uuid4()),
-                filename=f"{repo.name}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}",
+                id=new_id(),
+                filename=f"{repo.name}-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}",
                 status=ScanStatus.RUNNING,  # Use proper enum
-                created_at=datetime.utcnow()
+                created_at=datetime.now(timezone.utc)
             )
             await scan_repository.create(scan_job)
 
@@ -68,7 +67,7 @@ class RepositoryScanner:
                 # Save findings
                 for finding in findings:
                     finding.job_id = scan_job.id
-                    await finding_repository.create(finding)
+                await finding_repository.bulk_create(findings)
 
                 # Update scan job
                 await scan_repository.update_completion(
@@ -78,7 +77,7 @@ class RepositoryScanner:
                 )
 
                 # Update repository with current timestamp
-                current_time = datetime.utcnow()
+                current_time = datetime.now(timezone.utc)
                 await repository_repository.update_scan_status(
                     repository_id,
                     "completed",
@@ -112,7 +111,7 @@ class RepositoryScanner:
                 await repository_repository.update_scan_status(
                     repository_id,
                     "error",
-                    datetime.utcnow(),
+                    datetime.now(timezone.utc),
                     error=str(e)
                 )
                 
@@ -226,7 +225,7 @@ class RepositoryScanner:
             "gitleaks_available": os.path.isfile(self.gitleaks_path) if self.gitleaks_path else False,
             "gitleaks_path": self.gitleaks_path,
             "scanner_initialized": self.scanner is not None,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
 
@@ -2,44 +2,279 @@ import os
 import subprocess
 import json
 import re
+import math
+import functools
 import yaml
-from typing import List
-from datetime import datetime
+from collections import Counter
+from typing import List, NamedTuple, Optional, Pattern, Tuple
+from datetime import datetime, timezone
 
 from models.finding import Finding
 from services.redact import is_in_allowlist
 
+# Entropie de Shannon (bits/caractère) pour les candidats aws_secret_key :
+# en dessous du minimum le match est rejeté, en dessous du seuil il est pénalisé
+AWS_SECRET_MIN_ENTROPY = 3.5
+AWS_SECRET_ENTROPY_THRESHOLD = 4.0
+
+# Default patterns for common secrets (avec confidence ajustée)
+# "literals": mots-clés (en minuscules) dont au moins un doit apparaître pour
+# que la regex puisse matcher ; sert de préfiltre avant la regex
+_DEFAULT_PATTERNS = {
+    "aws_access_key": {
+        "pattern": r"\bAKIA[0-9A-Z]{16}\b",
+        "severity": "critical",
+        "confidence": 0.95,  # Très confiant pour AKIA pattern
+        "literals": ("akia",)
+    },
+    "aws_secret_key": {
+        "pattern": r"\b[A-Za-z0-9/+=]{40}\b",
+        "severity": "critical",
+        "confidence": 0.6  # Plus faible car pattern générique
+    },
+    "github_token": {
+        "pattern": r"\bghp_[A-Za-z0-9]{36}\b",
+        "severity": "high",
+        "confidence": 0.95,
+        "literals": ("ghp_",)
+    },
+    "github_fine_grained_pat": {
+        "pattern": r"\bgithub_pat_[A-Za-z0-9_]{82}\b",
+        "severity": "high",
+        "confidence": 0.95,
+        "literals": ("github_pat_",)
+    },
+    "stripe_secret_key": {
+        "pattern": r"\bsk_live_[A-Za-z0-9]{24}\b",
+        "severity": "critical",
+        "confidence": 0.95,
+        "literals": ("sk_live_",)
+    },
+    "stripe_publishable_key": {
+        "pattern": r"\bpk_live_[A-Za-z0-9]{24}\b",
+        "severity": "medium",
+        "confidence": 0.9,
+        "literals": ("pk_live_",)
+    },
+    "jwt_token": {
+        "pattern": r"\beyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*\b",
+        "severity": "medium",
+        "confidence": 0.7,
+        "literals": ("eyj",)
+    },
+    "slack_token": {
+        "pattern": r"\bxox[baprs]-[A-Za-z0-9-]{8,}\b",
+        "severity": "high",
+        "confidence": 0.9,
+        "literals": ("xox",)
+    },
+    "google_api_key": {
+        "pattern": r"\bAIza[0-9A-Za-z_-]{35}\b",
+        "severity": "high",
+        "confidence": 0.9,
+        "literals": ("aiza",)
+    },
+    "private_key_header": {
+        "pattern": r"-----BEGIN[A-Z ]+PRIVATE KEY-----",
+        "severity": "critical",
+        "confidence": 0.95,
+        "literals": ("-----begin",)
+    },
+    "database_url": {
+        "pattern": r"\b(postgresql|mysql|mongodb)://[^\s'\"]+\b",
+        "severity": "critical",
+        "confidence": 0.85,
+        "literals": ("postgresql://", "mysql://", "mongodb://")
+    },
+    "generic_api_key": {
+        "pattern": r"\b[aA]pi[_-]?[kK]ey['\"]?\s*[:=]\s*['\"]?[A-Za-z0-9_-]{16,}['\"]?",
+        "severity": "medium",
+        "confidence": 0.5,  # Faible car très générique
+        "literals": ("api",)
+    },
+    "generic_secret": {
+        "pattern": r"\b[sS]ecret['\"]?\s*[:=]\s*['\"]?[A-Za-z0-9_-]{16,}['\"]?",
+        "severity": "medium",
+        "confidence": 0.5,
+        "literals": ("secret",)
+    },
+    "generic_token": {
+        "pattern": r"\b[tT]oken['\"]?\s*[:=]\s*['\"]?[A-Za-z0-9_-]{16,}['\"]?",
+        "severity": "medium",
+        "confidence": 0.5,
+        "literals": ("token",)
+    }
+}
+
+# Répertoires ignorés pendant le parcours
+SKIP_DIRS = frozenset({
+    'node_modules', '__pycache__', '.git', '.vscode', '.idea',
+    'venv', 'env', '.env', 'build', 'dist', 'target',
+    '.pytest_cache', '.mypy_cache', '.coverage', '.tox',
+    'vendor', 'third_party', 'external', '.venv',
+    '.sass-cache', 'bower_components', '.nuxt', '.next'
+})
+
+# Skip binary files and common non-text files
+SKIP_EXTENSIONS = frozenset({
+    # Images
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.ico', '.webp',
+    # Archives
+    '.zip', '.tar', '.gz', '.rar', '.7z', '.bz2', '.xz',
+    # Executables and libraries
+    '.exe', '.dll', '.so', '.dylib', '.a', '.lib',
+    # Office documents
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    # Media files
+    '.mp3', '.mp4', '.avi', '.mov', '.wav', '.flac', '.ogg',
+    # Compiled files
+    '.pyc', '.pyo', '.class', '.o', '.obj',
+    # Fonts
+    '.woff', '.woff2', '.ttf', '.eot', '.otf',
+    # Other binary
+    '.bin', '.dat', '.db', '.sqlite', '.sqlite3'
+})
+
+MAX_SCAN_FILE_SIZE = 10 * 1024 * 1024
+
+# Taille des blocs lus par fichier pendant le scan regex
+READ_CHUNK_SIZE = 1 << 20
+# Ligne plus longue qu'un bloc (bundle minifié...) : seuls ces derniers caractères
+# sont reportés sur le bloc suivant, largement plus qu'un secret, dont les premiers
+# ne servent que de contexte (`\b`, lookbehinds) au scan de la suite
+LONG_LINE_OVERLAP = 4096
+LONG_LINE_CONTEXT = 64
+
+PATTERNS_FILE = "rules/patterns.yaml"
+ALLOWLIST_FILE = "rules/allowlist.yaml"
+
+def _rules_file_key(path: str) -> Tuple[str, Optional[float]]:
+    """Cache key for a rules file: its path and current mtime (None if missing)"""
+    try:
+        return path, os.path.getmtime(path)
+    except OSError:
+        return path, None
+
+@functools.lru_cache(maxsize=4)
+def _load_yaml_cached(path: str, mtime: Optional[float]) -> dict:
+    """Parse a YAML rules file once per (path, mtime)"""
+    if mtime is None:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
+
+# Ajustements de confidence (_calculate_adjusted_confidence)
+FALSE_POSITIVE_KEYWORDS = (
+    'example', 'test', 'demo', 'placeholder', 'fake', 'dummy', 'sample',
+    'your_key_here', 'insert_key_here', 'put_key_here', 'replace_with',
+    'todo', 'fixme', 'xxx', 'yyy', 'zzz', 'abc', '123',
+    'lorem', 'ipsum', 'dolor'
+)
+
+# Patterns évidemment faux
+FALSE_POSITIVE_PATTERNS = tuple(re.compile(p) for p in (
+    r'^x+$',        # All x's
+    r'^\*+$',       # All asterisks
+    r'^0+$',        # All zeros
+    r'^1+$',        # All ones
+    r'^[a-z]+$',    # All lowercase letters
+    r'^[A-Z]+$',    # All uppercase letters
+    r'^\d+$',       # All digits
+    r'^\$\{.*\}$',  # Environment variable placeholder
+    r'^<.*>$',      # XML/HTML placeholder
+    r'^\[.*\]$',    # Bracket placeholder
+))
+
+DOC_EXTENSIONS = frozenset({'.md', '.txt', '.rst'})
+DOC_FILENAMES = frozenset({'readme.md', 'changelog.md', 'contributing.md'})
+EXAMPLE_LINE_WORDS = ('example', 'demo', 'test', 'placeholder')
+GENERIC_RULES = frozenset({"generic_api_key", "generic_secret", "generic_token"})
+
+_HAS_LETTER = re.compile(r'[A-Za-z]')
+_HAS_DIGIT = re.compile(r'[0-9]')
+
+def shannon_entropy(text: str) -> float:
+    """Shannon entropy of a string, in bits per character"""
+    if not text:
+        return 0.0
+    length = len(text)
+    return -sum(count / length * math.log2(count / length) for count in Counter(text).values())
+
+class CompiledRule(NamedTuple):
+    """Regex rule ready for scanning"""
+    rule_id: str
+    regex: Pattern
+    severity: str
+    confidence: float
+    literals: Tuple[str, ...]  # Empty: no prefilter, always run the regex
+
+@functools.lru_cache(maxsize=4)
+def _compile_rules(path: str, mtime: Optional[float]) -> Tuple[CompiledRule, ...]:
+    """Compile default + custom patterns into scan rules"""
+    try:
+        custom_patterns = _load_yaml_cached(path, mtime)
+    except Exception:
+        custom_patterns = {}
+    
+    rules = []
+    for rule_id, rule_config in {**_DEFAULT_PATTERNS, **custom_patterns}.items():
+        if isinstance(rule_config, dict):
+            pattern_str = rule_config.get("pattern", "")
+            severity = rule_config.get("severity", "medium")
+            base_confidence = rule_config.get("confidence", 0.7)
+            literals = tuple(str(lit).lower() for lit in rule_config.get("literals", ()))
+        else:
+            # Handle case where rule_config is just a string pattern
+            pattern_str = str(rule_config)
+            severity = "medium"
+            base_confidence = 0.7
+            literals = ()
+        
+        if not pattern_str:
+            continue
+        
+        try:
+            rules.append(CompiledRule(
+                rule_id, re.compile(pattern_str, re.IGNORECASE), severity, base_confidence, literals
+            ))
+        except re.error as e:
+            print(f"Invalid regex pattern for rule '{rule_id}': {e}")
+    
+    return tuple(rules)
+
+class RawFinding(NamedTuple):
+    """Lightweight match record, promoted to a Finding only once it survives filtering"""
+    rule_id: str
+    file_path: str
+    line_number: int
+    secret: str
+    severity: str
+    confidence: float
+
 class ScanRunner:
     """Main scanning service that orchestrates different scanners"""
     
     def __init__(self):
+        self._patterns_key = _rules_file_key(PATTERNS_FILE)
         self.patterns = self._load_patterns()
         self.allowlist = self._load_allowlist()
         self.min_confidence = 0.7  # Confidence minimale pour reporter un finding
     
     def _load_patterns(self) -> dict:
-        """Load custom patterns from YAML"""
-        patterns_file = "rules/patterns.yaml"
-        if os.path.exists(patterns_file):
-            try:
-                with open(patterns_file, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f) or {}
-            except Exception as e:
-                print(f"Error loading patterns file: {e}")
-                return {}
-        return {}
+        """Load custom patterns from YAML (cached until the file changes)"""
+        try:
+            return _load_yaml_cached(*self._patterns_key)
+        except Exception as e:
+            print(f"Error loading patterns file: {e}")
+            return {}
     
     def _load_allowlist(self) -> dict:
-        """Load allowlist from YAML"""
-        allowlist_file = "rules/allowlist.yaml"
-        if os.path.exists(allowlist_file):
-            try:
-                with open(allowlist_file, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f) or {}
-            except Exception as e:
-                print(f"Error loading allowlist file: {e}")
-                return {}
-        return {}
+        """Load allowlist from YAML (cached until the file changes)"""
+        try:
+            return _load_yaml_cached(*_rules_file_key(ALLOWLIST_FILE))
+        except Exception as e:
+            print(f"Error loading allowlist file: {e}")
+            return {}
     
     def _is_file_allowlisted(self, file_path: str) -> bool:
         """Check if file should be ignored based on allowlist"""
@@ -103,7 +338,7 @@ class ScanRunner:
         except Exception as e:
             print(f"Regex scan failed: {e}")
         
-        # Filter findings through allowlist and confidence
+        # Filter raw matches through allowlist and confidence
         filtered_findings = []
         for finding in findings:
             try:
@@ -125,9 +360,25 @@ class ScanRunner:
                 filtered_findings.append(finding)
         
         print(f"Total findings after filtering: {len(filtered_findings)} (removed {len(findings) - len(filtered_findings)} low-confidence/allowlisted findings)")
-        return filtered_findings
+        
+        # Materialize Finding objects for survivors only
+        now = datetime.now(timezone.utc)
+        return [
+            Finding(
+                job_id="",  # Will be set by caller
+                file_path=raw.file_path,
+                line_number=raw.line_number,
+                secret_type=raw.rule_id,
+                secret=raw.secret,
+                severity=raw.severity,
+                rule_id=raw.rule_id,
+                confidence=raw.confidence,
+                created_at=now
+            )
+            for raw in filtered_findings
+        ]
     
-    async def _run_gitleaks(self, directory: str) -> List[Finding]:
+    async def _run_gitleaks(self, directory: str) -> List[RawFinding]:
         """Run Gitleaks scanner"""
         findings = []
         
@@ -173,18 +424,15 @@ class ScanRunner:
                             print(f"Skipping allowlisted file from Gitleaks: {file_path}")
                             continue
                         
-                        finding = Finding(
-                            job_id="",  # Will be set by caller
-                            file_path=file_path,
-                            line_number=item.get("StartLine", 0),
-                            secret_type=item.get("RuleID", "unknown"),
-                            secret=item.get("Secret", ""),
-                            severity=self._map_gitleaks_severity(item.get("RuleID", "")),
-                            rule_id=item.get("RuleID", ""),
-                            confidence=0.9,  # Gitleaks has high confidence
-                            created_at=datetime.utcnow()
-                        )
-                        findings.append(finding)
+                        rule_id = item.get("RuleID") or "unknown"
+                        findings.append(RawFinding(
+                            rule_id,
+                            file_path,
+                            item.get("StartLine", 0),
+                            item.get("Secret", ""),
+                            self._map_gitleaks_severity(rule_id),
+                            0.9  # Gitleaks has high confidence
+                        ))
                 except json.JSONDecodeError as e:
                     print(f"Error parsing gitleaks JSON output: {e}")
         
@@ -197,86 +445,12 @@ class ScanRunner:
         
         return findings
     
-    async def _run_regex_scan(self, directory: str) -> List[Finding]:
+    async def _run_regex_scan(self, directory: str) -> List[RawFinding]:
         """Run custom regex-based scan"""
         findings = []
         
-        # Default patterns for common secrets (avec confidence ajustée)
-        default_patterns = {
-            "aws_access_key": {
-                "pattern": r"\bAKIA[0-9A-Z]{16}\b",
-                "severity": "critical",
-                "confidence": 0.95  # Très confiant pour AKIA pattern
-            },
-            "aws_secret_key": {
-                "pattern": r"\b[A-Za-z0-9/+=]{40}\b",
-                "severity": "critical",
-                "confidence": 0.6  # Plus faible car pattern générique
-            },
-            "github_token": {
-                "pattern": r"\bghp_[A-Za-z0-9]{36}\b",
-                "severity": "high",
-                "confidence": 0.95
-            },
-            "github_fine_grained_pat": {
-                "pattern": r"\bgithub_pat_[A-Za-z0-9_]{82}\b",
-                "severity": "high",
-                "confidence": 0.95
-            },
-            "stripe_secret_key": {
-                "pattern": r"\bsk_live_[A-Za-z0-9]{24}\b",
-                "severity": "critical",
-                "confidence": 0.95
-            },
-            "stripe_publishable_key": {
-                "pattern": r"\bpk_live_[A-Za-z0-9]{24}\b",
-                "severity": "medium",
-                "confidence": 0.9
-            },
-            "jwt_token": {
-                "pattern": r"\beyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*\b",
-                "severity": "medium",
-                "confidence": 0.7
-            },
-            "slack_token": {
-                "pattern": r"\bxox[baprs]-[A-Za-z0-9-]{8,}\b",
-                "severity": "high",
-                "confidence": 0.9
-            },
-            "google_api_key": {
-                "pattern": r"\bAIza[0-9A-Za-z_-]{35}\b",
-                "severity": "high",
-                "confidence": 0.9
-            },
-            "private_key_header": {
-                "pattern": r"-----BEGIN[A-Z ]+PRIVATE KEY-----",
-                "severity": "critical",
-                "confidence": 0.95
-            },
-            "database_url": {
-                "pattern": r"\b(postgresql|mysql|mongodb)://[^\s'\"]+\b",
-                "severity": "critical",
-                "confidence": 0.85
-            },
-            "generic_api_key": {
-                "pattern": r"\b[aA]pi[_-]?[kK]ey['\"]?\s*[:=]\s*['\"]?[A-Za-z0-9_-]{16,}['\"]?",
-                "severity": "medium",
-                "confidence": 0.5  # Faible car très générique
-            },
-            "generic_secret": {
-                "pattern": r"\b[sS]ecret['\"]?\s*[:=]\s*['\"]?[A-Za-z0-9_-]{16,}['\"]?",
-                "severity": "medium",
-                "confidence": 0.5
-            },
-            "generic_token": {
-                "pattern": r"\b[tT]oken['\"]?\s*[:=]\s*['\"]?[A-Za-z0-9_-]{16,}['\"]?",
-                "severity": "medium",
-                "confidence": 0.5
-            }
-        }
-        
-        # Merge with custom patterns
-        all_patterns = {**default_patterns, **self.patterns}
+        # Default + custom patterns, compiled once per patterns file version
+        rules = _compile_rules(*self._patterns_key)
         
         scanned_files = 0
         skipped_files = 0
@@ -286,10 +460,9 @@ class ScanRunner:
             dirs[:] = [d for d in dirs if not self._should_skip_directory(d)]
             
             for file in files:
-                if not self._should_scan_file(file):
-                    continue
-                    
                 file_path = os.path.join(root, file)
+                if not self._should_scan_file(file_path):
+                    continue
                 
                 # Check if file is allowlisted
                 if self._is_file_allowlisted(file_path):
@@ -299,7 +472,7 @@ class ScanRunner:
                     continue
                 
                 try:
-                    file_findings = self._scan_file(file_path, all_patterns)
+                    file_findings = self._scan_file(file_path, rules)
                     findings.extend(file_findings)
                     scanned_files += 1
                     
@@ -315,142 +488,159 @@ class ScanRunner:
     
     def _should_skip_directory(self, dirname: str) -> bool:
         """Check if directory should be skipped"""
-        skip_dirs = {
-            'node_modules', '__pycache__', '.git', '.vscode', '.idea',
-            'venv', 'env', '.env', 'build', 'dist', 'target',
-            '.pytest_cache', '.mypy_cache', '.coverage', '.tox',
-            'vendor', 'third_party', 'external', '.venv',
-            '.sass-cache', 'bower_components', '.nuxt', '.next'
-        }
-        return dirname in skip_dirs or dirname.startswith('.')
+        return dirname in SKIP_DIRS or dirname.startswith('.')
     
-    def _should_scan_file(self, filename: str) -> bool:
-        """Check if file should be scanned"""
-        # Skip binary files and common non-text files
-        skip_extensions = {
-            # Images
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg', '.ico', '.webp',
-            # Archives
-            '.zip', '.tar', '.gz', '.rar', '.7z', '.bz2', '.xz',
-            # Executables and libraries
-            '.exe', '.dll', '.so', '.dylib', '.a', '.lib',
-            # Office documents
-            '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
-            # Media files
-            '.mp3', '.mp4', '.avi', '.mov', '.wav', '.flac', '.ogg',
-            # Compiled files
-            '.pyc', '.pyo', '.class', '.o', '.obj',
-            # Fonts
-            '.woff', '.woff2', '.ttf', '.eot', '.otf',
-            # Other binary
-            '.bin', '.dat', '.db', '.sqlite', '.sqlite3'
-        }
-        
-        _, ext = os.path.splitext(filename.lower())
-        if ext in skip_extensions:
+    def _should_scan_file(self, file_path: str) -> bool:
+        """Check if file should be scanned (expects the full path)"""
+        _, ext = os.path.splitext(file_path.lower())
+        if ext in SKIP_EXTENSIONS:
             return False
         
-        # Skip very large files (> 10MB) to avoid memory issues
+        # Skip very large files (> 10MB)
         try:
-            file_path = filename if os.path.isabs(filename) else os.path.join(os.getcwd(), filename)
-            if os.path.getsize(file_path) > 10 * 1024 * 1024:
+            if os.path.getsize(file_path) > MAX_SCAN_FILE_SIZE:
                 return False
-        except (OSError, FileNotFoundError):
+        except OSError:
             # If we can't get file size, assume it's scannable
             pass
         
         return True
     
-    def _scan_file(self, file_path: str, patterns: dict) -> List[Finding]:
+    def _scan_file(self, file_path: str, rules: Tuple[CompiledRule, ...]) -> List[RawFinding]:
         """Scan individual file with regex patterns"""
-        findings = []
-        
         try:
             # Try to read the file with UTF-8 encoding first
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                return self._scan_file_stream(file_path, rules, 'utf-8')
             except UnicodeDecodeError:
                 # If UTF-8 fails, try with latin-1 (which accepts all byte values)
                 try:
-                    with open(file_path, 'r', encoding='latin-1') as f:
-                        content = f.read()
+                    return self._scan_file_stream(file_path, rules, 'latin-1')
                 except Exception:
                     # If all encoding attempts fail, skip this file
-                    return findings
-            
-            # Split content into lines for line number tracking
-            lines = content.split('\n')
+                    return []
+        
+        except Exception as e:
+            print(f"Error scanning file {file_path}: {e}")
+            return []
+    
+    def _scan_file_stream(self, file_path: str, rules: Tuple[CompiledRule, ...], encoding: str) -> List[RawFinding]:
+        """Read a file in chunks and scan complete lines, so memory stays bounded by the chunk size
+
+        A line longer than a chunk is scanned in windows: only its last
+        LONG_LINE_OVERLAP characters are carried over, and matches are
+        deduplicated by start position across windows.
+        """
+        findings = []
+        
+        # Create relative path for cleaner display (once per file)
+        try:
+            rel_path = os.path.relpath(file_path)
+        except ValueError:
+            rel_path = file_path
+        
+        line_no = 0
+        with open(file_path, 'r', encoding=encoding) as f:
+            # La dernière ligne (incomplète) d'un chunk est reportée sur le suivant
+            tail = ''
+            # Début, dans `tail`, des matches pas encore traités de la ligne en cours
+            skip = 0
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                block = tail + chunk
+                cut = block.rfind('\n')
+                if cut == -1:
+                    # Pas de fin de ligne dans le bloc : on scanne la ligne jusqu'à la
+                    # fenêtre de recouvrement, seule reportée. Un match qui commence
+                    # dans la fenêtre sera trouvé entier au bloc suivant
+                    carried = len(block) - LONG_LINE_OVERLAP
+                    stop = carried + LONG_LINE_CONTEXT
+                    if stop <= skip:
+                        tail = block
+                        continue
+                    _, reach = self._scan_lines(
+                        block, line_no, rules, file_path, rel_path, findings, skip, stop
+                    )
+                    # Reprise après le dernier match traité, comme sur la ligne entière
+                    skip = max(reach, stop) - carried
+                    tail = block[carried:]
+                    continue
+                tail = block[cut + 1:]
+                line_no, _ = self._scan_lines(block[:cut], line_no, rules, file_path, rel_path, findings, skip)
+                skip = 0
             
-            for line_no, line in enumerate(lines, 1):
-                for rule_id, rule_config in patterns.items():
-                    try:
-                        # Get pattern string and other config
-                        if isinstance(rule_config, dict):
-                            pattern_str = rule_config.get("pattern", "")
-                            severity = rule_config.get("severity", "medium")
-                            base_confidence = rule_config.get("confidence", 0.7)
-                        else:
-                            # Handle case where rule_config is just a string pattern
-                            pattern_str = str(rule_config)
-                            severity = "medium"
-                            base_confidence = 0.7
+            self._scan_lines(tail, line_no, rules, file_path, rel_path, findings, skip)
+        
+        return findings
+    
+    def _scan_lines(
+        self, text: str, line_offset: int, rules: Tuple[CompiledRule, ...],
+        file_path: str, rel_path: str, findings: List[RawFinding],
+        skip: int = 0, stop: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """Scan a block of complete lines, appending to findings
+
+        On the first line, which may continue a long line already scanned in
+        part, matching starts at `skip` and stops before `stop`. Returns the last
+        line number and the end of the furthest match on that first line.
+        """
+        lines = text.split('\n')
+        reach = 0
+        
+        # Préfiltre : ne garder que les règles dont un mot-clé apparaît dans le bloc
+        text_lower = text.lower()
+        active_rules = [
+            rule for rule in rules
+            if not rule.literals or any(lit in text_lower for lit in rule.literals)
+        ]
+        if not active_rules:
+            return line_offset + len(lines), reach
+        
+        for line_no, line in enumerate(lines, line_offset + 1):
+            first_line = line_no == line_offset + 1
+            line_lower = line.lower()
+            for rule_id, compiled_pattern, severity, base_confidence, literals in active_rules:
+                # Skip the regex when none of the rule's keywords is on this line
+                if literals and not any(lit in line_lower for lit in literals):
+                    continue
+                try:
+                    # pos plutôt qu'un slice : `\b` et les lookbehinds voient le contexte reporté
+                    for match in compiled_pattern.finditer(line, skip if first_line else 0):
+                        if first_line:
+                            if stop is not None and match.start() >= stop:
+                                break
+                            reach = max(reach, match.end())
+                        matched_text = match.group().strip()
+                        
+                        # Skip empty matches or very short ones
+                        if len(matched_text) < 3:
+                            continue
                         
-                        if not pattern_str:
+                        # Pattern AWS très générique : rejeter les chaînes à faible entropie
+                        if rule_id == "aws_secret_key" and shannon_entropy(matched_text) < AWS_SECRET_MIN_ENTROPY:
                             continue
                         
-                        # Compile and use regex pattern
-                        try:
-                            compiled_pattern = re.compile(pattern_str, re.IGNORECASE)
-                            matches = compiled_pattern.finditer(line)
-                            
-                            for match in matches:
-                                matched_text = match.group().strip()
-                                
-                                # Skip empty matches or very short ones
-                                if len(matched_text) < 3:
-                                    continue
-                                
-                                # Calculer confidence ajustée selon le contexte
-                                adjusted_confidence = self._calculate_adjusted_confidence(
-                                    matched_text, rule_id, file_path, line, base_confidence
-                                )
-                                
-                                # Skip si confidence trop faible
-                                if adjusted_confidence < 0.3:
-                                    continue
-                                
-                                # Create relative path for cleaner display
-                                try:
-                                    rel_path = os.path.relpath(file_path)
-                                except ValueError:
-                                    rel_path = file_path
-                                
-                                finding = Finding(
-                                    job_id="",  # Will be set by caller
-                                    file_path=rel_path,
-                                    line_number=line_no,
-                                    secret_type=rule_id,
-                                    secret=matched_text,
-                                    severity=severity,
-                                    rule_id=rule_id,
-                                    confidence=adjusted_confidence,
-                                    created_at=datetime.utcnow()
-                                )
-                                findings.append(finding)
+                        # Calculer confidence ajustée selon le contexte
+                        adjusted_confidence = self._calculate_adjusted_confidence(
+                            matched_text, rule_id, file_path, line, base_confidence
+                        )
                         
-                        except re.error as e:
-                            print(f"Invalid regex pattern for rule '{rule_id}': {e}")
+                        # Skip si confidence trop faible
+                        if adjusted_confidence < 0.3:
                             continue
-                    
-                    except Exception as e:
-                        print(f"Error applying pattern '{rule_id}' to {file_path} line {line_no}: {e}")
-                        continue
-        
-        except Exception as e:
-            print(f"Error scanning file {file_path}: {e}")
+                        
+                        findings.append(RawFinding(
+                            rule_id, rel_path, line_no, matched_text,
+                            severity, adjusted_confidence
+                        ))
+                
+                except Exception as e:
+                    print(f"Error applying pattern '{rule_id}' to {file_path} line {line_no}: {e}")
+                    continue
         
-        return findings
+        return line_offset + len(lines), reach
     
     def _calculate_adjusted_confidence(self, match: str, rule_id: str, file_path: str, line_context: str, base_confidence: float) -> float:
         """Calculate adjusted confidence based on context and false positive detection"""
@@ -458,33 +648,13 @@ class ScanRunner:
         match_lower = match.lower().strip()
         
         # Réduire confidence pour placeholders évidents
-        false_positive_keywords = {
-            'example', 'test', 'demo', 'placeholder', 'fake', 'dummy', 'sample',
-            'your_key_here', 'insert_key_here', 'put_key_here', 'replace_with',
-            'todo', 'fixme', 'xxx', 'yyy', 'zzz', 'abc', '123',
-            'lorem', 'ipsum', 'dolor'
-        }
-        
-        for keyword in false_positive_keywords:
+        for keyword in FALSE_POSITIVE_KEYWORDS:
             if keyword in match_lower:
                 confidence *= 0.1  # Très faible confidence
                 
         # Patterns évidemment faux
-        false_positive_patterns = [
-            r'^x+$',        # All x's
-            r'^\*+$',       # All asterisks  
-            r'^0+$',        # All zeros
-            r'^1+$',        # All ones
-            r'^[a-z]+$',    # All lowercase letters
-            r'^[A-Z]+$',    # All uppercase letters
-            r'^\d+$',       # All digits
-            r'^\$\{.*\}$',  # Environment variable placeholder
-            r'^<.*>$',      # XML/HTML placeholder
-            r'^\[.*\]$',    # Bracket placeholder
-        ]
-        
-        for pattern in false_positive_patterns:
-            if re.match(pattern, match_lower):
+        for pattern in FALSE_POSITIVE_PATTERNS:
+            if pattern.match(match_lower):
                 confidence *= 0.1
         
         # Contexte du fichier
@@ -492,9 +662,9 @@ class ScanRunner:
         filename = os.path.basename(file_path.lower())
         
         # Réduire confidence dans certains types de fichiers
-        if file_ext in ['.md', '.txt', '.rst']:
+        if file_ext in DOC_EXTENSIONS:
             confidence *= 0.5  # Documentation souvent des exemples
-        elif filename in ['readme.md', 'changelog.md', 'contributing.md']:
+        elif filename in DOC_FILENAMES:
             confidence *= 0.3
         elif 'test' in filename or 'spec' in filename:
             confidence *= 0.4  # Fichiers de test souvent des fakes
@@ -503,7 +673,7 @@ class ScanRunner:
         
         # Contexte de ligne
         line_lower = line_context.lower()
-        if any(word in line_lower for word in ['example', 'demo', 'test', 'placeholder']):
+        if any(word in line_lower for word in EXAMPLE_LINE_WORDS):
             confidence *= 0.3
         elif 'const' in line_lower or 'var' in line_lower or 'let' in line_lower:
             confidence *= 1.1  # Code réel plus probable
@@ -513,7 +683,7 @@ class ScanRunner:
         # Rule-specific adjustments
         if rule_id == "aws_secret_key":
             # Pattern très générique, besoin de plus de validation
-            if not self._looks_like_base64(match):
+            if shannon_entropy(match) < AWS_SECRET_ENTROPY_THRESHOLD:
                 confidence *= 0.3
             if len(match) != 40:
                 confidence *= 0.5
@@ -525,32 +695,15 @@ class ScanRunner:
             elif len(match) < 50:
                 confidence *= 0.4
                 
-        elif rule_id in ["generic_api_key", "generic_secret", "generic_token"]:
+        elif rule_id in GENERIC_RULES:
             # Patterns très génériques, être très strict
             if len(match) < 16:
                 confidence *= 0.3
-            if not re.search(r'[A-Za-z]', match) or not re.search(r'[0-9]', match):
+            if not _HAS_LETTER.search(match) or not _HAS_DIGIT.search(match):
                 confidence *= 0.2
         
         return max(0.0, min(1.0, confidence))
     
-    def _looks_like_base64(self, text: str) -> bool:
-        """Check if text looks like base64"""
-        if not text:
-            return False
-        
-        # Base64 uses A-Z, a-z, 0-9, +, /
-        valid_chars = re.match(r'^[A-Za-z0-9+/]*={0,2}$', text)
-        if not valid_chars:
-            return False
-        
-        # Should have good mix of character types
-        has_upper = bool(re.search(r'[A-Z]', text))
-        has_lower = bool(re.search(r'[a-z]', text))
-        has_digits = bool(re.search(r'[0-9]', text))
-        
-        return sum([has_upper, has_lower, has_digits]) >= 2
-    
     def _map_gitleaks_severity(self, rule_id: str) -> str:
         """Map Gitleaks rules to severity levels"""
         rule_id_lower = rule_id.lower()
@@ -1,10 +1,8 @@
 import asyncio
-import schedule
-import time
-from datetime import datetime, timedelta
-from typing import List
-import threading
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional
 
+from core.config import settings
 from storage.repositories import repository_repository
 from services.repository_scanner import repository_scanner
 from models.repository import RepositoryStatus
@@ -14,67 +12,64 @@ class SchedulerService:
     
     def __init__(self):
         self.running = False
-        self.thread = None
+        self._tasks: List[asyncio.Task] = []
+        # Bound the number of repository scans running at the same time; created in
+        # start(): before 3.10 a primitive binds to the loop current at creation,
+        # and the singleton below is built at import
+        self._scan_sem: Optional[asyncio.Semaphore] = None
     
     def start(self):
-        """Start the scheduler in a background thread"""
+        """Start the scheduler on the running event loop"""
         if not self.running:
             self.running = True
-            self.thread = threading.Thread(target=self._run_scheduler, daemon=True)
-            self.thread.start()
+            self._scan_sem = asyncio.Semaphore(settings.MAX_CONCURRENT_SCANS)
+            self._tasks = [
+                # Repository scans every 30 minutes
+                asyncio.create_task(self._periodic(30 * 60, self._scan_repositories)),
+                # Cleanup every hour
+                asyncio.create_task(self._periodic(60 * 60, self._perform_cleanup)),
+            ]
             print("📅 Scheduler started")
     
     def stop(self):
         """Stop the scheduler"""
         self.running = False
-        if self.thread:
-            self.thread.join()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
         print("📅 Scheduler stopped")
     
-    def _run_scheduler(self):
-        """Run the scheduler loop"""
-        # Schedule repository scans every 30 minutes
-        schedule.every(30).minutes.do(self._schedule_repository_scans)
-        
-        # Schedule cleanup every hour
-        schedule.every().hour.do(self._cleanup_old_scans)
-        
+    async def _periodic(self, interval: float, job: Callable[[], Awaitable[None]]):
+        """Run a job every `interval` seconds while the scheduler is running"""
         while self.running:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-    
-    def _schedule_repository_scans(self):
-        """Schedule scans for active repositories"""
-        try:
-            # Run in async context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self._scan_repositories())
-            loop.close()
-        except Exception as e:
-            print(f"Error in scheduled repository scan: {e}")
+            await asyncio.sleep(interval)
+            try:
+                await job()
+            except Exception as e:
+                print(f"Error in scheduled job {job.__name__}: {e}")
     
     async def _scan_repositories(self):
         """Scan all active repositories"""
         try:
             repositories = await repository_repository.get_active_repositories()
             
+            tasks = []
             for repo in repositories:
                 # Check if repository needs scanning (last scan > 30 minutes ago)
                 if self._should_scan_repository(repo):
                     print(f"🔍 Scheduling scan for {repo.name}")
-                    
-                    # Start background scan
-                    asyncio.create_task(
-                        repository_scanner.scan_repository(repo.id)
-                    )
-                    
-                    # Small delay between scans to avoid overwhelming
-                    await asyncio.sleep(5)
+                    tasks.append(asyncio.create_task(self._guarded_scan(repo.id)))
+            
+            await asyncio.gather(*tasks, return_exceptions=True)
                     
         except Exception as e:
             print(f"Error scanning repositories: {e}")
     
+    async def _guarded_scan(self, repository_id: str):
+        """Scan a repository once a concurrency slot is available"""
+        async with self._scan_sem:
+            await repository_scanner.scan_repository(repository_id)
+    
     def _should_scan_repository(self, repo) -> bool:
         """Check if repository should be scanned"""
         if repo.status != RepositoryStatus.ACTIVE:
@@ -84,24 +79,14 @@ class SchedulerService:
             return True
         
         # Scan if last scan was more than 30 minutes ago
-        time_since_scan = datetime.utcnow() - repo.last_scan
+        time_since_scan = datetime.now(timezone.utc) - repo.last_scan
         return time_since_scan > timedelta(minutes=30)
     
-    def _cleanup_old_scans(self):
-        """Cleanup old scan data"""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self._perform_cleanup())
-            loop.close()
-        except Exception as e:
-            print(f"Error in cleanup: {e}")
-    
     async def _perform_cleanup(self):
         """Perform cleanup of old data"""
         try:
             # Clean up scan jobs older than 7 days
-            cutoff_date = datetime.utcnow() - timedelta(days=7)
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=7)
             
             # This would be implemented in the repository
             # await scan_repository.cleanup_old_scans(cutoff_date)
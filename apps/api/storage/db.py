@@ -1,13 +1,104 @@
+import asyncio
+import os
 import aiosqlite
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List
 from datetime import datetime
 
 DATABASE_FILE = "secrethawk.db"
 
-_db_connection: aiosqlite.Connection | None = None  # singleton connection
+# Applied to every connection: WAL lets readers run alongside the writer and
+# turns each commit into a single log append instead of two fsyncs
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-64000;
+    PRAGMA mmap_size=268435456;
+    PRAGMA foreign_keys=ON;
+"""
+
+# WITHOUT ROWID: rows live directly in the id primary-key B-tree instead of a
+# rowid table plus a separate autoindex on the TEXT id
+FINDINGS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS findings (
+        id TEXT PRIMARY KEY,
+        job_id TEXT NOT NULL,
+        file_path TEXT NOT NULL,
+        line_number INTEGER NOT NULL,
+        secret_type TEXT NOT NULL,
+        secret TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        rule_id TEXT NOT NULL,
+        confidence REAL NOT NULL,
+        created_at TEXT NOT NULL,
+        FOREIGN KEY (job_id) REFERENCES scans (id)
+    ) WITHOUT ROWID
+"""
+
+# Per-job aggregates of findings, kept current by triggers so statistics are
+# read from a handful of rows instead of aggregating the whole job.
+# dim is 'sev' (severity), 'type' (secret_type) or 'file' (file_path).
+FINDING_STATS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS finding_stats (
+        job_id TEXT NOT NULL,
+        dim TEXT NOT NULL,
+        value TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (job_id, dim, value)
+    ) WITHOUT ROWID;
+
+    CREATE TRIGGER IF NOT EXISTS findings_stats_ai AFTER INSERT ON findings BEGIN
+        INSERT INTO finding_stats VALUES (new.job_id, 'sev', new.severity, 1)
+            ON CONFLICT (job_id, dim, value) DO UPDATE SET count = count + 1;
+        INSERT INTO finding_stats VALUES (new.job_id, 'type', new.secret_type, 1)
+            ON CONFLICT (job_id, dim, value) DO UPDATE SET count = count + 1;
+        INSERT INTO finding_stats VALUES (new.job_id, 'file', new.file_path, 1)
+            ON CONFLICT (job_id, dim, value) DO UPDATE SET count = count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS findings_stats_ad AFTER DELETE ON findings BEGIN
+        UPDATE finding_stats SET count = count - 1
+            WHERE job_id = old.job_id AND ((dim = 'sev' AND value = old.severity)
+                OR (dim = 'type' AND value = old.secret_type)
+                OR (dim = 'file' AND value = old.file_path));
+        DELETE FROM finding_stats WHERE job_id = old.job_id AND count <= 0;
+    END;
+"""
+
+FINDING_STATS_BACKFILL = """
+    INSERT INTO finding_stats (job_id, dim, value, count)
+    SELECT job_id, 'sev', severity, COUNT(*) FROM findings GROUP BY job_id, severity
+    UNION ALL
+    SELECT job_id, 'type', secret_type, COUNT(*) FROM findings GROUP BY job_id, secret_type
+    UNION ALL
+    SELECT job_id, 'file', file_path, COUNT(*) FROM findings GROUP BY job_id, file_path
+"""
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Read-only connections kept next to the single writer
+READER_POOL_SIZE = min(os.cpu_count() or 1, 4)
+
+_db_pool: "DBPool | None" = None  # singleton pool
+# Créé au premier besoin, dans la boucle courante : avant 3.10 un Lock se lie à
+# la boucle active à sa création, qui n'est pas encore celle de l'application à l'import
+_db_lock: "asyncio.Lock | None" = None
+
+
+def _pool_lock() -> asyncio.Lock:
+    """Lock guarding the pool singleton, created on the running loop"""
+    global _db_lock
+    if _db_lock is None:
+        _db_lock = asyncio.Lock()
+    return _db_lock
+
 
 async def init_db():
     """Initialize the database with required tables"""
     async with aiosqlite.connect(DATABASE_FILE) as db:
+        await db.executescript(CONNECTION_PRAGMAS)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS scans (
                 id TEXT PRIMARY KEY,
@@ -19,23 +110,18 @@ async def init_db():
                 error TEXT
             )
         """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS findings (
-                id TEXT PRIMARY KEY,
-                job_id TEXT NOT NULL,
-                file_path TEXT NOT NULL,
-                line_number INTEGER NOT NULL,
-                secret_type TEXT NOT NULL,
-                secret TEXT NOT NULL,
-                severity TEXT NOT NULL,
-                rule_id TEXT NOT NULL,
-                confidence REAL NOT NULL,
-                created_at TEXT NOT NULL,
-                FOREIGN KEY (job_id) REFERENCES scans (id)
-            )
-        """)
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_findings_job_id ON findings(job_id)")
+        await db.execute(FINDINGS_TABLE_SQL)
+        await _migrate_findings_without_rowid(db)
+        # Index composite : couvre WHERE job_id = ? et l'ORDER BY de la pagination (id départage le curseur)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_findings_job_sev_created_id ON findings(job_id, severity, created_at, id)")
+        await db.execute("DROP INDEX IF EXISTS idx_findings_job_sev_created")
+        await db.execute("DROP INDEX IF EXISTS idx_findings_job_id")
         await db.execute("CREATE INDEX IF NOT EXISTS idx_findings_severity ON findings(severity)")
+        await db.executescript(FINDING_STATS_SCHEMA)
+        # Base existante : on remplit les agrégats une seule fois
+        cursor = await db.execute("SELECT 1 FROM finding_stats LIMIT 1")
+        if await cursor.fetchone() is None:
+            await db.execute(FINDING_STATS_BACKFILL)
         await db.execute("""
             CREATE TABLE IF NOT EXISTS repositories (
                 id TEXT PRIMARY KEY,
@@ -53,15 +139,127 @@ async def init_db():
                 updated_at TEXT
             )
         """)
-        await db.execute("CREATE INDEX IF NOT EXISTS idx_repositories_status ON repositories(status)")
+        # (status, last_scan) : filtre et tri de get_active_repositories ; remplace l'index sur status seul
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_repositories_status_last_scan ON repositories(status, last_scan)")
+        await db.execute("DROP INDEX IF EXISTS idx_repositories_status")
         await db.execute("CREATE INDEX IF NOT EXISTS idx_repositories_last_scan ON repositories(last_scan)")
         await db.commit()
 
 
-async def get_db_connection() -> aiosqlite.Connection:
-    """Return a singleton database connection"""
-    global _db_connection
-    if _db_connection is None:
-        _db_connection = await aiosqlite.connect(DATABASE_FILE)
-        _db_connection.row_factory = aiosqlite.Row
-    return _db_connection
+async def _migrate_findings_without_rowid(db: aiosqlite.Connection):
+    """Rebuild a findings table created before it became WITHOUT ROWID"""
+    cursor = await db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'findings'")
+    row = await cursor.fetchone()
+    if row is None or "WITHOUT ROWID" in row[0].upper():
+        return
+    # Les index et triggers suivent l'ancienne table et disparaissent avec elle ;
+    # init_db les recrée ensuite sur la nouvelle
+    async with txn(db):
+        await db.execute("ALTER TABLE findings RENAME TO findings_rowid")
+        await db.execute(FINDINGS_TABLE_SQL)
+        await db.execute("""
+            INSERT INTO findings (id, job_id, file_path, line_number, secret_type, secret,
+                                  severity, rule_id, confidence, created_at)
+            SELECT id, job_id, file_path, line_number, secret_type, secret,
+                   severity, rule_id, confidence, created_at
+            FROM findings_rowid
+        """)
+        await db.execute("DROP TABLE findings_rowid")
+
+
+async def _open_connection(read_only: bool = False) -> aiosqlite.Connection:
+    db = await aiosqlite.connect(DATABASE_FILE, cached_statements=STATEMENT_CACHE_SIZE)
+    db.row_factory = aiosqlite.Row
+    await db.executescript(CONNECTION_PRAGMAS)
+    if read_only:
+        await db.execute("PRAGMA query_only=ON")
+    return db
+
+
+class DBPool:
+    """One writer connection plus a few reader connections.
+
+    Under WAL each reader works on its own snapshot, so SELECTs run in
+    parallel on their aiosqlite threads while writes stay serialized on
+    the single writer (no SQLITE_BUSY between our own connections).
+    """
+
+    def __init__(self, writer: aiosqlite.Connection, readers: List[aiosqlite.Connection]):
+        self._writer = writer
+        self._write_lock = asyncio.Lock()
+        self._readers: asyncio.Queue = asyncio.Queue()
+        for reader in readers:
+            self._readers.put_nowait(reader)
+        self._connections = [writer, *readers]
+
+    @classmethod
+    async def open(cls, size: int = READER_POOL_SIZE) -> "DBPool":
+        writer = await _open_connection()
+        readers = [await _open_connection(read_only=True) for _ in range(size)]
+        return cls(writer, readers)
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        db = await self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put_nowait(db)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        async with self._write_lock:
+            yield self._writer
+
+    async def close(self):
+        for db in self._connections:
+            await db.close()
+
+
+async def get_db_pool() -> DBPool:
+    """Return the singleton connection pool"""
+    global _db_pool
+    if _db_pool is None:
+        async with _pool_lock():
+            if _db_pool is None:
+                _db_pool = await DBPool.open()
+    return _db_pool
+
+
+@asynccontextmanager
+async def db_reader() -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow a read-only connection from the pool"""
+    pool = await get_db_pool()
+    async with pool.reader() as db:
+        yield db
+
+
+@asynccontextmanager
+async def db_writer() -> AsyncIterator[aiosqlite.Connection]:
+    """Hold the pool's writer connection"""
+    pool = await get_db_pool()
+    async with pool.writer() as db:
+        yield db
+
+
+@asynccontextmanager
+async def txn(db: aiosqlite.Connection) -> AsyncIterator[aiosqlite.Connection]:
+    """Run a block in one BEGIN IMMEDIATE transaction (commit, or rollback on error)"""
+    await db.execute("BEGIN IMMEDIATE")
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+
+
+async def close_db_pool():
+    """Close every pooled connection (application shutdown)"""
+    global _db_pool, _db_lock
+    async with _pool_lock():
+        if _db_pool is not None:
+            await _db_pool.close()
+            _db_pool = None
+    # Une prochaine boucle (tests, asyncio.run successifs) recrée le sien
+    _db_lock = None
@@ -1,14 +1,195 @@
+import asyncio
+import itertools
+import os
+import sqlite3
+import time
 import uuid
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
 import aiosqlite
 
 from models.scan import ScanJob, ScanStatus
 from models.finding import Finding
-from storage.db import get_db_connection
-from models.repository import Repository, RepositoryStatus, RepositoryUpdate
+from storage.db import db_reader, db_writer, txn
+from models.repository import Repository, RepositorySummary, RepositoryUpdate
 from core.security import encrypt_token, decrypt_token
 
+# datetime.fromisoformat est implémenté en C : on le lie une fois au niveau module
+_fromisoformat = datetime.fromisoformat
+
+# Rows per executemany() batch in FindingRepository.bulk_create (SQLite < 3.32)
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Multi-row INSERT ... VALUES: rows per statement, bounded by SQLITE_MAX_VARIABLE_NUMBER
+# (999 before SQLite 3.32, 32766 since) divided by the 10 finding columns
+_SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+VALUES_INSERT_CHUNK_SIZE = _SQLITE_MAX_VARIABLES // 10
+
+# Chemin de bulk_create choisi selon la version de SQLite : avec les clés UUIDv7, les
+# INSERT multi-lignes de 3276 lignes battent executemany (~1.5x sur 3.40) ; avec la
+# limite de 999 variables d'avant 3.32 (99 lignes par requête), on garde executemany
+BULK_INSERT_USE_VALUES = sqlite3.sqlite_version_info >= (3, 32, 0)
+
+# UUIDv7 (RFC 9562) state: last millisecond used and the 12-bit sequence within it
+_uuid7_last_ms = 0
+_uuid7_seq = 0
+
+# Keyset pagination position: (severity, created_at, id) of the last row served
+FindingCursor = Tuple[str, str, str]
+
+# Shared SQL texts: identical strings hit the connection's prepared statement cache
+_SCAN_SELECT_SQL = """
+    SELECT id, filename, status, created_at, completed_at, findings_count, error
+    FROM scans
+"""
+
+# Column order of _FINDING_SELECT_SQL, minus created_at (parsed separately)
+_FINDING_FIELDS = (
+    "id", "job_id", "file_path", "line_number", "secret_type",
+    "secret", "severity", "rule_id", "confidence",
+)
+
+_FINDING_SELECT_SQL = (
+    "SELECT id, job_id, file_path, line_number, secret_type, secret, severity, rule_id, confidence, created_at "
+    "FROM findings WHERE job_id = ?"
+)
+
+_REPOSITORY_SELECT_SQL = """
+    SELECT id, url, provider, name, token, status, webhook_secret,
+           discord_webhook_url, last_scan, last_scan_status, findings_count,
+           created_at, updated_at
+    FROM repositories
+"""
+_REPOSITORY_BY_ID_SQL = _REPOSITORY_SELECT_SQL + " WHERE id = ?"
+_REPOSITORY_ALL_SQL = _REPOSITORY_SELECT_SQL + " ORDER BY created_at DESC"
+_REPOSITORY_ACTIVE_SQL = _REPOSITORY_SELECT_SQL + " WHERE status = ? ORDER BY last_scan ASC NULLS FIRST"
+_REPOSITORY_RECENT_SQL = _REPOSITORY_SELECT_SQL + " WHERE last_scan IS NOT NULL ORDER BY last_scan DESC LIMIT ?"
+
+_FINDING_ORDER_SQL = " ORDER BY severity DESC, created_at DESC, id DESC"
+_FINDING_ITER_SQL = _FINDING_SELECT_SQL + _FINDING_ORDER_SQL
+
+
+def _finding_filters_sql(severity: bool, secret_type: bool) -> str:
+    return (" AND severity = ?" if severity else "") + (" AND secret_type = ?" if secret_type else "")
+
+
+# Every filter/paging combination is built once, so each call reuses a constant
+# SQL text (and its prepared statement) instead of concatenating a new one.
+# Keys: (severity?, secret_type?, mode) with mode "seek" (keyset), "offset" or "first"
+_FINDING_PAGE_SQL = {
+    (sev, typ, mode): (
+        _FINDING_SELECT_SQL + _finding_filters_sql(sev, typ)
+        + (" AND (severity, created_at, id) < (?, ?, ?)" if mode == "seek" else "")
+        + _FINDING_ORDER_SQL + " LIMIT ?"
+        + (" OFFSET ?" if mode == "offset" else "")
+    )
+    for sev in (False, True) for typ in (False, True) for mode in ("first", "seek", "offset")
+}
+
+# Keys: (severity?, secret_type?)
+_FINDING_COUNT_SQL = {
+    (sev, typ): "SELECT COUNT(*) FROM findings WHERE job_id = ?" + _finding_filters_sql(sev, typ)
+    for sev in (False, True) for typ in (False, True)
+}
+
+# Optional columns of RepositoryRepository.update, in SET order; keyed by which are present
+_REPOSITORY_UPDATE_COLUMNS = ("name", "token", "status", "discord_webhook_url")
+_REPOSITORY_UPDATE_SQL = {
+    mask: "UPDATE repositories SET " + ", ".join(
+        [f"{column} = ?" for column, present in zip(_REPOSITORY_UPDATE_COLUMNS, mask) if present]
+        + ["updated_at = ?"]
+    ) + " WHERE id = ?"
+    for mask in itertools.product((False, True), repeat=len(_REPOSITORY_UPDATE_COLUMNS))
+}
+
+# Pre-aggregated counters maintained by the finding_stats triggers (storage.db)
+_FINDING_STATS_SQL = "SELECT dim, value, count FROM finding_stats WHERE job_id = ?"
+
+# List view projection: no token column, so nothing to decrypt
+_REPOSITORY_SUMMARY_SQL = """
+    SELECT id, name, url, provider, status, last_scan, last_scan_status,
+           findings_count, created_at
+    FROM repositories ORDER BY created_at DESC
+"""
+
+_INSERT_FINDING_SQL = """
+    INSERT INTO findings 
+    (id, job_id, file_path, line_number, secret_type, secret, 
+     severity, rule_id, confidence, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@lru_cache(maxsize=8)
+def _insert_findings_values_sql(row_count: int) -> str:
+    """INSERT with row_count VALUES tuples (full chunks always reuse the same text)"""
+    return (
+        "INSERT INTO findings (id, job_id, file_path, line_number, secret_type, secret, "
+        "severity, rule_id, confidence, created_at) VALUES "
+        + ",".join(["(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"] * row_count)
+    )
+
+
+def new_id() -> str:
+    """Time-ordered UUIDv7 string for primary keys.
+
+    Successive ids sort after each other, so inserts land on the rightmost
+    B-tree leaf instead of splitting pages across the whole id index.
+    """
+    global _uuid7_last_ms, _uuid7_seq
+    ms = time.time_ns() // 1_000_000
+    if ms > _uuid7_last_ms:
+        _uuid7_seq = int.from_bytes(os.urandom(2), "big") & 0x7FF
+    else:
+        # Même milliseconde (ou horloge qui recule) : on incrémente la séquence
+        ms = _uuid7_last_ms
+        _uuid7_seq += 1
+        if _uuid7_seq > 0xFFF:
+            ms += 1
+            _uuid7_seq = 0
+    _uuid7_last_ms = ms
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    value = (ms << 80) | (0x7 << 76) | (_uuid7_seq << 64) | (0b10 << 62) | rand_b
+    return str(uuid.UUID(int=value))
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored ISO-8601 timestamp, NULL columns map to None"""
+    if not value:
+        return None
+    parsed = _fromisoformat(value)
+    # Lignes écrites avant le passage à l'UTC aware : naïves, mais déjà en UTC
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _row_to_finding(row) -> Finding:
+    """Build a Finding from a _FINDING_SELECT_SQL row.
+
+    Rows come from our own schema, so pydantic validation is skipped.
+    """
+    return Finding.model_construct(**dict(zip(_FINDING_FIELDS, row)), created_at=_parse_iso(row[9]))
+
+
+def _row_to_repository(row) -> Repository:
+    """Build a Repository from a _REPOSITORY_SELECT_SQL row"""
+    return Repository(
+        id=row[0], url=row[1], provider=row[2], name=row[3], token=decrypt_token(row[4]),
+        status=row[5], webhook_secret=row[6],
+        discord_webhook_url=row[7] if row[7] else None,
+        last_scan=_parse_iso(row[8]),
+        last_scan_status=row[9], findings_count=row[10],
+        created_at=_parse_iso(row[11]),
+        updated_at=_parse_iso(row[12])
+    )
+
+
+def _rows_to_repositories(rows) -> List[Repository]:
+    return [_row_to_repository(row) for row in rows]
+
+
 # -------------------------------
 # Scan Repository
 # -------------------------------
@@ -17,32 +198,29 @@ class ScanRepository:
 
     async def create(self, scan_job: ScanJob) -> ScanJob:
         """Create a new scan job"""
-        scan_job.id = scan_job.id or str(uuid.uuid4())
-        scan_job.created_at = scan_job.created_at or datetime.utcnow()
-
-        db = await get_db_connection()
-        await db.execute("""
-            INSERT INTO scans (id, filename, status, created_at)
-            VALUES (?, ?, ?, ?)
-        """, (scan_job.id, scan_job.filename, scan_job.status, scan_job.created_at.isoformat()))
-        await db.commit()
+        scan_job.id = scan_job.id or new_id()
+        scan_job.created_at = scan_job.created_at or datetime.now(timezone.utc)
+
+        async with db_writer() as db:
+            await db.execute("""
+                INSERT INTO scans (id, filename, status, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (scan_job.id, scan_job.filename, scan_job.status, scan_job.created_at.isoformat()))
+            await db.commit()
         return scan_job
 
     async def get_by_id(self, scan_id: str) -> Optional[ScanJob]:
         """Get scan job by ID"""
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT id, filename, status, created_at, completed_at, findings_count, error
-            FROM scans WHERE id = ?
-        """, (scan_id,))
-        row = await cursor.fetchone()
+        async with db_reader() as db:
+            cursor = await db.execute(_SCAN_SELECT_SQL + " WHERE id = ?", (scan_id,))
+            row = await cursor.fetchone()
         if row:
             return ScanJob(
                 id=row[0],
                 filename=row[1],
                 status=ScanStatus(row[2]),
-                created_at=datetime.fromisoformat(row[3]),
-                completed_at=datetime.fromisoformat(row[4]) if row[4] else None,
+                created_at=_parse_iso(row[3]),
+                completed_at=_parse_iso(row[4]),
                 findings_count=row[5],
                 error=row[6]
             )
@@ -50,47 +228,42 @@ class ScanRepository:
 
     async def update_status(self, scan_id: str, status: ScanStatus, error: Optional[str] = None):
         """Update scan job status"""
-        db = await get_db_connection()
-        await db.execute("UPDATE scans SET status = ?, error = ? WHERE id = ?", (status, error, scan_id))
-        await db.commit()
+        async with db_writer() as db:
+            await db.execute("UPDATE scans SET status = ?, error = ? WHERE id = ?", (status, error, scan_id))
+            await db.commit()
 
     async def update_completion(self, scan_id: str, status: str, findings_count: int):
         """Update scan job completion"""
-        db = await get_db_connection()
-        await db.execute("""
-            UPDATE scans
-            SET status = ?, completed_at = ?, findings_count = ?
-            WHERE id = ?
-        """, (status, datetime.utcnow().isoformat(), findings_count, scan_id))
-        await db.commit()
+        async with db_writer() as db:
+            await db.execute("""
+                UPDATE scans
+                SET status = ?, completed_at = ?, findings_count = ?
+                WHERE id = ?
+            """, (status, datetime.now(timezone.utc).isoformat(), findings_count, scan_id))
+            await db.commit()
 
     async def count_by_status(self, status: str) -> int:
         """Count scans by status"""
-        db = await get_db_connection()
-        cursor = await db.execute("SELECT COUNT(*) FROM scans WHERE status = ?", (status,))
-        result = await cursor.fetchone()
+        async with db_reader() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM scans WHERE status = ?", (status,))
+            result = await cursor.fetchone()
         return result[0] if result else 0
 
     async def count_completed_since(self, since_date: datetime) -> int:
         """Count completed scans since a specific date"""
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT COUNT(*) FROM scans 
-            WHERE status = 'completed' AND completed_at >= ?
-        """, (since_date.isoformat(),))
-        result = await cursor.fetchone()
+        async with db_reader() as db:
+            cursor = await db.execute("""
+                SELECT COUNT(*) FROM scans 
+                WHERE status = 'completed' AND completed_at >= ?
+            """, (since_date.isoformat(),))
+            result = await cursor.fetchone()
         return result[0] if result else 0
 
     async def get_recent(self, limit: int = 10) -> List[ScanJob]:
         """Get recent scans"""
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT id, filename, status, created_at, completed_at, findings_count, error
-            FROM scans 
-            ORDER BY created_at DESC 
-            LIMIT ?
-        """, (limit,))
-        rows = await cursor.fetchall()
+        async with db_reader() as db:
+            cursor = await db.execute(_SCAN_SELECT_SQL + " ORDER BY created_at DESC LIMIT ?", (limit,))
+            rows = await cursor.fetchall()
         
         scans = []
         for row in rows:
@@ -98,8 +271,8 @@ class ScanRepository:
                 id=row[0],
                 filename=row[1],
                 status=ScanStatus(row[2]),
-                created_at=datetime.fromisoformat(row[3]),
-                completed_at=datetime.fromisoformat(row[4]) if row[4] else None,
+                created_at=_parse_iso(row[3]),
+                completed_at=_parse_iso(row[4]),
                 findings_count=row[5],
                 error=row[6]
             ))
@@ -114,125 +287,162 @@ class FindingRepository:
 
     async def create(self, finding: Finding) -> Finding:
         """Create a new finding"""
-        finding.id = str(uuid.uuid4())
-        finding.created_at = datetime.utcnow()
-
-        db = await get_db_connection()
-        await db.execute("""
-            INSERT INTO findings 
-            (id, job_id, file_path, line_number, secret_type, secret, 
-             severity, rule_id, confidence, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            finding.id, finding.job_id, finding.file_path, finding.line_number,
-            finding.secret_type, finding.secret, finding.severity, finding.rule_id,
-            finding.confidence, finding.created_at.isoformat()
-        ))
-        await db.commit()
+        finding.id = new_id()
+        finding.created_at = datetime.now(timezone.utc)
+
+        async with db_writer() as db:
+            await db.execute(_INSERT_FINDING_SQL, (
+                finding.id, finding.job_id, finding.file_path, finding.line_number,
+                finding.secret_type, finding.secret, finding.severity, finding.rule_id,
+                finding.confidence, finding.created_at.isoformat()
+            ))
+            await db.commit()
         return finding
 
-    async def get_by_job_id(
-        self, job_id: str, page: int = 1, size: int = 20,
-        severity: Optional[str] = None, secret_type: Optional[str] = None
-    ) -> List[Finding]:
-        """Get paginated findings by job ID"""
-        offset = (page - 1) * size
-        query = "SELECT id, job_id, file_path, line_number, secret_type, secret, severity, rule_id, confidence, created_at FROM findings WHERE job_id = ?"
-        params = [job_id]
+    def _prepare_bulk_rows(self, findings: List[Finding]) -> List[tuple]:
+        """Assign ids and a shared timestamp, return the INSERT parameter rows"""
+        created_at = datetime.now(timezone.utc)
+        created_at_iso = created_at.isoformat()
+        for finding in findings:
+            finding.id = new_id()
+            finding.created_at = created_at
+
+        return [
+            (f.id, f.job_id, f.file_path, f.line_number, f.secret_type, f.secret,
+             f.severity, f.rule_id, f.confidence, created_at_iso)
+            for f in findings
+        ]
+
+    async def bulk_create(self, findings: List[Finding]) -> List[Finding]:
+        """Create many findings in a single transaction.
+
+        Rows go in with one multi-row INSERT ... VALUES per chunk when the
+        SQLite build allows large statements (BULK_INSERT_USE_VALUES), with
+        executemany otherwise.
+        """
+        if not findings:
+            return findings
+
+        rows = self._prepare_bulk_rows(findings)
+        async with db_writer() as db, txn(db):
+            if BULK_INSERT_USE_VALUES:
+                for start in range(0, len(rows), VALUES_INSERT_CHUNK_SIZE):
+                    batch = rows[start:start + VALUES_INSERT_CHUNK_SIZE]
+                    await db.execute(
+                        _insert_findings_values_sql(len(batch)),
+                        [value for row in batch for value in row],
+                    )
+            else:
+                for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                    await db.executemany(_INSERT_FINDING_SQL, rows[start:start + BULK_INSERT_CHUNK_SIZE])
+        return findings
 
+    async def get_by_job_id(
+        self, job_id: str, after: Optional[FindingCursor] = None, size: int = 20,
+        severity: Optional[str] = None, secret_type: Optional[str] = None, page: int = 1
+    ) -> Tuple[List[Finding], Optional[FindingCursor]]:
+        """Get a page of findings by job ID and the cursor of the next page.
+
+        With ``after`` the page starts right after that (severity, created_at, id)
+        tuple (index seek); otherwise ``page`` falls back to LIMIT/OFFSET.
+        """
+        params: List[Any] = [job_id]
         if severity:
-            query += " AND severity = ?"
             params.append(severity)
         if secret_type:
-            query += " AND secret_type = ?"
             params.append(secret_type)
 
-        query += " ORDER BY severity DESC, created_at DESC LIMIT ? OFFSET ?"
-        params.extend([size, offset])
+        if after is not None:
+            mode = "seek"
+            params.extend(after)
+            params.append(size)
+        elif page > 1:
+            mode = "offset"
+            params.extend((size, (page - 1) * size))
+        else:
+            mode = "first"
+            params.append(size)
+        query = _FINDING_PAGE_SQL[(bool(severity), bool(secret_type), mode)]
 
         findings = []
-        db = await get_db_connection()
-        cursor = await db.execute(query, params)
-        rows = await cursor.fetchall()
+        async with db_reader() as db:
+            cursor = await db.execute(query, params)
+            rows = await cursor.fetchall()
         for row in rows:
-            findings.append(Finding(
-                id=row[0], job_id=row[1], file_path=row[2], line_number=row[3],
-                secret_type=row[4], secret=row[5], severity=row[6], rule_id=row[7],
-                confidence=row[8], created_at=datetime.fromisoformat(row[9])
-            ))
-        return findings
+            findings.append(_row_to_finding(row))
+
+        next_cursor = None
+        if len(rows) == size:
+            last = rows[-1]
+            next_cursor = (last[6], last[9], last[0])
+        return findings, next_cursor
 
-    async def get_all_by_job_id(self, job_id: str) -> List[Finding]:
-        """Get all findings by job ID"""
-        return await self.get_by_job_id(job_id, page=1, size=10000)
+    async def iter_by_job_id(self, job_id: str) -> AsyncIterator[Finding]:
+        """Stream all findings of a job, in pagination order, without loading them all"""
+        async with db_reader() as db:
+            async with db.execute(_FINDING_ITER_SQL, (job_id,)) as cursor:
+                async for row in cursor:
+                    yield _row_to_finding(row)
 
     async def count_by_job_id(
         self, job_id: str, severity: Optional[str] = None, secret_type: Optional[str] = None
     ) -> int:
         """Count findings by job ID"""
-        query = "SELECT COUNT(*) FROM findings WHERE job_id = ?"
+        query = _FINDING_COUNT_SQL[(bool(severity), bool(secret_type))]
         params = [job_id]
         if severity:
-            query += " AND severity = ?"
             params.append(severity)
         if secret_type:
-            query += " AND secret_type = ?"
             params.append(secret_type)
 
-        db = await get_db_connection()
-        cursor = await db.execute(query, params)
-        result = await cursor.fetchone()
+        async with db_reader() as db:
+            cursor = await db.execute(query, params)
+            result = await cursor.fetchone()
         return result[0] if result else 0
 
     async def get_statistics_by_job_id(self, job_id: str) -> Dict[str, Any]:
         """Get statistics for a scan job"""
-        stats = {}
-        db = await get_db_connection()
-        
-        # Total findings
-        cursor = await db.execute("SELECT COUNT(*) FROM findings WHERE job_id = ?", (job_id,))
-        result = await cursor.fetchone()
-        stats["total"] = result[0] if result else 0
-
-        # By severity
-        cursor = await db.execute("""
-            SELECT severity, COUNT(*) FROM findings WHERE job_id = ? GROUP BY severity
-        """, (job_id,))
-        rows = await cursor.fetchall()
-        for severity, count in rows:
-            stats[severity] = count
-
-        # By type
-        cursor = await db.execute("""
-            SELECT secret_type, COUNT(*) FROM findings WHERE job_id = ? GROUP BY secret_type ORDER BY COUNT(*) DESC
-        """, (job_id,))
-        rows = await cursor.fetchall()
-        stats["by_type"] = {secret_type: count for secret_type, count in rows}
-
-        # Unique files scanned
-        cursor = await db.execute("SELECT COUNT(DISTINCT file_path) FROM findings WHERE job_id = ?", (job_id,))
-        result = await cursor.fetchone()
-        stats["files_scanned"] = result[0] if result else 0
-
+        async with db_reader() as db:
+            cursor = await db.execute(_FINDING_STATS_SQL, (job_id,))
+            rows = await cursor.fetchall()
+
+        # Une ligne par (dimension, valeur) : total = somme des sévérités, fichiers = nb de lignes 'file'
+        total = 0
+        files_scanned = 0
+        by_severity: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        for dim, value, count in rows:
+            if dim == "sev":
+                by_severity[value] = count
+                total += count
+            elif dim == "type":
+                by_type[value] = count
+            else:
+                files_scanned += 1
+
+        stats: Dict[str, Any] = {"total": total}
+        stats.update(by_severity)
+        stats["by_type"] = dict(sorted(by_type.items(), key=lambda item: item[1], reverse=True))
+        stats["files_scanned"] = files_scanned
         return stats
 
     async def count_by_severity(self, severity: str) -> int:
         """Count findings by severity across all scans"""
-        db = await get_db_connection()
-        cursor = await db.execute("SELECT COUNT(*) FROM findings WHERE severity = ?", (severity,))
-        result = await cursor.fetchone()
+        async with db_reader() as db:
+            cursor = await db.execute("SELECT COUNT(*) FROM findings WHERE severity = ?", (severity,))
+            result = await cursor.fetchone()
         return result[0] if result else 0
 
     async def get_severity_stats_for_scan(self, scan_id: str) -> Dict[str, int]:
         """Get severity statistics for a specific scan"""
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT severity, COUNT(*) as count 
-            FROM findings 
-            WHERE job_id = ? 
-            GROUP BY severity
-        """, (scan_id,))
-        rows = await cursor.fetchall()
+        async with db_reader() as db:
+            cursor = await db.execute("""
+                SELECT severity, COUNT(*) as count 
+                FROM findings 
+                WHERE job_id = ? 
+                GROUP BY severity
+            """, (scan_id,))
+            rows = await cursor.fetchall()
         
         stats = {"total": 0, "critical": 0, "high": 0, "medium": 0, "low": 0}
         for severity, count in rows:
@@ -250,176 +460,125 @@ class RepositoryRepository:
 
     async def create(self, repository: Repository) -> Repository:
         """Create a new repository"""
-        repository.id = repository.id or str(uuid.uuid4())
+        repository.id = repository.id or new_id()
         repository.url = str(repository.url).rstrip("/")
         encrypted_token = encrypt_token(repository.token)
+        discord_webhook_url = str(repository.discord_webhook_url) if repository.discord_webhook_url else None
 
-        db = await get_db_connection()
-        await db.execute("""
-            INSERT INTO repositories 
-            (id, url, provider, name, token, status, webhook_secret, discord_webhook_url, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            repository.id, repository.url, repository.provider, repository.name,
-            encrypted_token, repository.status, repository.webhook_secret,
-            str(repository.discord_webhook_url) if repository.discord_webhook_url else None,
-            repository.created_at.isoformat()
-        ))
-        await db.commit()
+        async with db_writer() as db:
+            await db.execute("""
+                INSERT INTO repositories 
+                (id, url, provider, name, token, status, webhook_secret, discord_webhook_url, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                repository.id, repository.url, repository.provider, repository.name,
+                encrypted_token, repository.status, repository.webhook_secret,
+                discord_webhook_url, repository.created_at.isoformat()
+            ))
+            await db.commit()
         return repository
 
     async def get_by_id(self, repository_id: str) -> Optional[Repository]:
         """Get repository by ID"""
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT id, url, provider, name, token, status, webhook_secret,
-                   discord_webhook_url, last_scan, last_scan_status, findings_count,
-                   created_at, updated_at
-            FROM repositories WHERE id = ?
-        """, (repository_id,))
-        row = await cursor.fetchone()
+        async with db_reader() as db:
+            cursor = await db.execute(_REPOSITORY_BY_ID_SQL, (repository_id,))
+            row = await cursor.fetchone()
         if row:
-            decrypted_token = decrypt_token(row[4])
-            return Repository(
-                id=row[0], url=row[1], provider=row[2], name=row[3], token=decrypted_token,
-                status=row[5], webhook_secret=row[6],
-                discord_webhook_url=row[7] if row[7] else None,
-                last_scan=datetime.fromisoformat(row[8]) if row[8] else None,
-                last_scan_status=row[9], findings_count=row[10],
-                created_at=datetime.fromisoformat(row[11]) if row[11] else None,
-                updated_at=datetime.fromisoformat(row[12]) if row[12] else None
-            )
+            return _row_to_repository(row)
         return None
 
     async def get_all(self) -> List[Repository]:
         """Get all repositories"""
-        repositories = []
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT id, url, provider, name, token, status, webhook_secret,
-                   discord_webhook_url, last_scan, last_scan_status, findings_count,
-                   created_at, updated_at
-            FROM repositories ORDER BY created_at DESC
-        """)
-        rows = await cursor.fetchall()
-        for row in rows:
-            decrypted_token = decrypt_token(row[4])
-            repositories.append(Repository(
-                id=row[0], url=row[1], provider=row[2], name=row[3], token=decrypted_token,
-                status=row[5], webhook_secret=row[6],
-                discord_webhook_url=row[7] if row[7] else None,
-                last_scan=datetime.fromisoformat(row[8]) if row[8] else None,
-                last_scan_status=row[9], findings_count=row[10],
-                created_at=datetime.fromisoformat(row[11]) if row[11] else None,
-                updated_at=datetime.fromisoformat(row[12]) if row[12] else None
-            ))
-        return repositories
+        async with db_reader() as db:
+            cursor = await db.execute(_REPOSITORY_ALL_SQL)
+            rows = await cursor.fetchall()
+        # Déchiffrement Fernet + parsing hors de la boucle d'événements, en un seul lot
+        return await asyncio.get_running_loop().run_in_executor(None, _rows_to_repositories, rows)
+
+    async def list_summaries(self) -> List[RepositorySummary]:
+        """List repositories without loading or decrypting their tokens"""
+        async with db_reader() as db:
+            cursor = await db.execute(_REPOSITORY_SUMMARY_SQL)
+            rows = await cursor.fetchall()
+        return [
+            RepositorySummary.model_construct(
+                id=row[0], name=row[1], url=row[2], provider=row[3], status=row[4],
+                last_scan=_parse_iso(row[5]), last_scan_status=row[6],
+                findings_count=row[7], created_at=_parse_iso(row[8])
+            )
+            for row in rows
+        ]
 
     async def get_active_repositories(self) -> List[Repository]:
         """Get all active repositories"""
-        repositories = []
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT id, url, provider, name, token, status, webhook_secret,
-                   discord_webhook_url, last_scan, last_scan_status, findings_count,
-                   created_at, updated_at
-            FROM repositories
-            WHERE status = ? ORDER BY last_scan ASC NULLS FIRST
-        """, ("active",))
-        rows = await cursor.fetchall()
-        for row in rows:
-            decrypted_token = decrypt_token(row[4])
-            repositories.append(Repository(
-                id=row[0], url=row[1], provider=row[2], name=row[3], token=decrypted_token,
-                status=RepositoryStatus(row[5]) if isinstance(row[5], str) else row[5], 
-                webhook_secret=row[6],
-                discord_webhook_url=row[7] if row[7] else None,
-                last_scan=datetime.fromisoformat(row[8]) if row[8] else None,
-                last_scan_status=row[9], findings_count=row[10],
-                created_at=datetime.fromisoformat(row[11]) if row[11] else None,
-                updated_at=datetime.fromisoformat(row[12]) if row[12] else None
-            ))
-        return repositories
+        async with db_reader() as db:
+            cursor = await db.execute(_REPOSITORY_ACTIVE_SQL, ("active",))
+            rows = await cursor.fetchall()
+        # Déchiffrement Fernet + parsing hors de la boucle d'événements, en un seul lot
+        return await asyncio.get_running_loop().run_in_executor(None, _rows_to_repositories, rows)
 
     async def get_recent_scans(self, limit: int = 10) -> List[Repository]:
         """Get repositories with recent scans"""
-        repositories = []
-        db = await get_db_connection()
-        cursor = await db.execute("""
-            SELECT id, url, provider, name, token, status, webhook_secret,
-                   discord_webhook_url, last_scan, last_scan_status, findings_count,
-                   created_at, updated_at
-            FROM repositories 
-            WHERE last_scan IS NOT NULL
-            ORDER BY last_scan DESC 
-            LIMIT ?
-        """, (limit,))
-        rows = await cursor.fetchall()
-        for row in rows:
-            decrypted_token = decrypt_token(row[4])
-            repositories.append(Repository(
-                id=row[0], url=row[1], provider=row[2], name=row[3], token=decrypted_token,
-                status=row[5], webhook_secret=row[6],
-                discord_webhook_url=row[7] if row[7] else None,
-                last_scan=datetime.fromisoformat(row[8]) if row[8] else None,
-                last_scan_status=row[9], findings_count=row[10],
-                created_at=datetime.fromisoformat(row[11]) if row[11] else None,
-                updated_at=datetime.fromisoformat(row[12]) if row[12] else None
-            ))
-        return repositories
+        async with db_reader() as db:
+            cursor = await db.execute(_REPOSITORY_RECENT_SQL, (limit,))
+            rows = await cursor.fetchall()
+        # Déchiffrement Fernet + parsing hors de la boucle d'événements, en un seul lot
+        return await asyncio.get_running_loop().run_in_executor(None, _rows_to_repositories, rows)
 
     async def update(self, repository_id: str, update_data: RepositoryUpdate) -> Repository:
         """Update repository"""
-        update_fields = []
-        params = []
-
+        now_iso = datetime.now(timezone.utc).isoformat()
+        values: Dict[str, Any] = {}
         if update_data.name is not None:
-            update_fields.append("name = ?")
-            params.append(update_data.name)
-        if update_data.token is not None:
-            update_fields.append("token = ?")
-            params.append(encrypt_token(update_data.token))
+            values["name"] = update_data.name
         if update_data.status is not None:
-            update_fields.append("status = ?")
-            params.append(update_data.status)
+            values["status"] = update_data.status
         if update_data.discord_webhook_url is not None:
-            update_fields.append("discord_webhook_url = ?")
-            params.append(str(update_data.discord_webhook_url))
-
-        update_fields.append("updated_at = ?")
-        params.append(datetime.utcnow().isoformat())
-        params.append(repository_id)
-
-        db = await get_db_connection()
-        await db.execute(f"UPDATE repositories SET {', '.join(update_fields)} WHERE id = ?", params)
-        await db.commit()
-        return await self.get_by_id(repository_id)
+            values["discord_webhook_url"] = str(update_data.discord_webhook_url)
+
+        # Écriture et relecture dans la même transaction, sur le writer
+        async with db_writer() as db, txn(db):
+            if update_data.token is not None:
+                # Token renvoyé à l'identique (édition du nom seul) : pas de re-chiffrement
+                cursor = await db.execute("SELECT token FROM repositories WHERE id = ?", (repository_id,))
+                current = await cursor.fetchone()
+                if current is None or decrypt_token(current[0]) != update_data.token:
+                    values["token"] = encrypt_token(update_data.token)
+
+            mask = tuple(column in values for column in _REPOSITORY_UPDATE_COLUMNS)
+            params = [values[column] for column in _REPOSITORY_UPDATE_COLUMNS if column in values]
+            params.extend((now_iso, repository_id))
+            await db.execute(_REPOSITORY_UPDATE_SQL[mask], params)
+            cursor = await db.execute(_REPOSITORY_BY_ID_SQL, (repository_id,))
+            row = await cursor.fetchone()
+        return _row_to_repository(row) if row else None
 
     async def update_scan_status(
         self, repository_id: str, status: str, scan_time: datetime,
         findings_count: Optional[int] = None, error: Optional[str] = None
     ):
         """Update repository scan status"""
-        db = await get_db_connection()
-        if findings_count is not None:
-            await db.execute("""
-                UPDATE repositories
-                SET last_scan = ?, last_scan_status = ?, findings_count = ?, updated_at = ?
-                WHERE id = ?
-            """, (scan_time.isoformat(), status, findings_count, datetime.utcnow().isoformat(), repository_id))
-        else:
-            await db.execute("""
-                UPDATE repositories
-                SET last_scan = ?, last_scan_status = ?, updated_at = ?
-                WHERE id = ?
-            """, (scan_time.isoformat(), status, datetime.utcnow().isoformat(), repository_id))
-        await db.commit()
+        now_iso = datetime.now(timezone.utc).isoformat()
+        async with db_writer() as db:
+            if findings_count is not None:
+                await db.execute("""
+                    UPDATE repositories
+                    SET last_scan = ?, last_scan_status = ?, findings_count = ?, updated_at = ?
+                    WHERE id = ?
+                """, (scan_time.isoformat(), status, findings_count, now_iso, repository_id))
+            else:
+                await db.execute("""
+                    UPDATE repositories
+                    SET last_scan = ?, last_scan_status = ?, updated_at = ?
+                    WHERE id = ?
+                """, (scan_time.isoformat(), status, now_iso, repository_id))
+            await db.commit()
 
     async def delete(self, repository_id: str):
         """Delete repository"""
-        db = await get_db_connection()
-        await db.execute("DELETE FROM repositories WHERE id = ?", (repository_id,))
-        await db.commit()
+        async with db_writer() as db:
+            await db.execute("DELETE FROM repositories WHERE id = ?", (repository_id,))
+            await db.commit()
 
 
 # -------------------------------
@@ -7,18 +7,136 @@ import os
 import sys
 import json
 import argparse
-import subprocess
 import yaml
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 import re
-import tempfile
+import io
+import mmap
+import itertools
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    import re2  # google-re2 (optionnel) : moteur linéaire, insensible au ReDoS
+except ImportError:
+    re2 = None
+
+try:
+    import orjson  # orjson (optionnel) : export JSON indenté en C
+except ImportError:
+    orjson = None
+
+try:
+    from scanners.run_gitleaks import GitleaksScanner
+except ImportError:
+    # Lancé en script (python cli/secrethawk.py) : la racine du dépôt n'est pas sur sys.path
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from scanners.run_gitleaks import GitleaksScanner
+
+GITLEAKS_CRITICAL_RULES = ("aws-access-token", "aws-secret-key", "stripe-access-token")
+GITLEAKS_HIGH_RULES = ("github-pat", "gitlab-pat", "slack-bot-token")
+# Une alternation par niveau, testée dans l'ordre de priorité
+GITLEAKS_SEVERITY_LEVELS = tuple(
+    (re.compile("|".join(re.escape(rule) for rule in rules)), severity)
+    for rules, severity in ((GITLEAKS_CRITICAL_RULES, "critical"), (GITLEAKS_HIGH_RULES, "high"))
+)
+
+
+@lru_cache(maxsize=None)
+def _gitleaks_severity_for_rule(rule_lower: str) -> str:
+    # Jeu de règles Gitleaks fini : chaque RuleID n'est classé qu'une fois
+    for regex, severity in GITLEAKS_SEVERITY_LEVELS:
+        if regex.search(rule_lower):
+            return severity
+    return "medium"
+
+SEVERITY_ORDER = ("critical", "high", "medium", "low")
+SEVERITY_EMOJI = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🔵"}
+
+# Below this size a plain read beats setting up a memory map
+MMAP_MIN_SIZE = 4096
+LONE_CR_RE = re.compile(rb"\r(?!\n)")
+
+# Binary sniffing: head size, control-byte ratio and maximum scanned file size
+BINARY_SNIFF_SIZE = 4096
+BINARY_CONTROL_RATIO = 0.3
+MAX_SCAN_FILE_SIZE = 10 * 1024 * 1024
+# Octets "texte" (tout sauf NUL..\b et \x0e..\x1f), supprimés par translate() pour compter le reste
+TEXT_BYTES = bytes(b for b in range(256) if not (b < 9 or 13 < b < 32))
+
+# Below this many candidate files, process start-up costs more than it saves
+PARALLEL_MIN_FILES = 64
+PARALLEL_CHUNK_SIZE = 32
+
+# Characters that end a literal prefix, and quantifiers that make its last character optional
+PREFIX_STOP_CHARS = frozenset(".^$*+?{}[]|()")
+PREFIX_OPTIONAL_QUANTIFIERS = frozenset("?*{")
+
+# Boundary lookarounds on a single character class; dropping them only widens a match,
+# which keeps a gate built without them a valid prefilter (RE2 has no lookarounds)
+BOUNDARY_LOOKAROUND_RE = re.compile(r"\(\?<?!\[[^\]]*\]\)")
+
+# Constructs that can match a newline or depend on string (not line) boundaries;
+# patterns containing them are never gated on the whole file buffer
+LINE_UNSAFE_TOKENS = ("\\A", "\\Z", "\\z", "(?<", "\\s", "\\S", "\\W", "\\D", "[^")
+
+def _literal_prefix(pattern: str) -> str:
+    """Literal text every match of the pattern starts with ('' when there is none)"""
+    # Les lookarounds de bordure ne consomment rien : le match commence toujours par la suite littérale
+    source = BOUNDARY_LOOKAROUND_RE.sub("", pattern)
+    if "|" in source or "(?" in source:
+        # Alternation, groupes ou flags inline : on ne devine pas
+        return ""
+
+    prefix = []
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            escaped = source[i + 1:i + 2]
+            if not escaped or escaped.isalnum():
+                # \d, \w, \b... : classe ou assertion, pas un littéral
+                break
+            literal, step = escaped, 2
+        elif char in PREFIX_STOP_CHARS:
+            break
+        else:
+            literal, step = char, 1
+        if source[i + step:i + step + 1] in PREFIX_OPTIONAL_QUANTIFIERS:
+            break
+        prefix.append(literal)
+        i += step
+    return "".join(prefix)
+
+
+@dataclass
+class Finding:
+    """A single secret hit; slotted since large scans hold thousands of them"""
+    # __slots__ explicite plutôt que dataclass(slots=True) : la CI tourne encore en 3.9
+    __slots__ = ("file", "line", "type", "secret", "secret_redacted", "severity", "description", "scanner")
+
+    file: str
+    line: int
+    type: str
+    secret: str
+    secret_redacted: str
+    severity: str
+    description: str
+    scanner: str
+
 
 class SecretHawkCLI:
     def __init__(self):
         self.ignore_patterns = self._load_ignore_patterns()
+        self._compile_ignore_patterns()
         self.patterns = self._load_patterns()
         self.allowlist = self._load_allowlist()
+        self._compile_patterns()
+        # Binaire résolu une fois ; --no-git comme l'ancien appel intégré à la CLI
+        self._gitleaks = GitleaksScanner(os.environ.get("GITLEAKS_BIN", "gitleaks"), no_git=True)
     
     def _load_ignore_patterns(self) -> List[str]:
         """Load ignore patterns from .secrethawkignore"""
@@ -50,22 +168,32 @@ class SecretHawkCLI:
         
         return patterns
     
+    def _compile_ignore_patterns(self):
+        """Split ignore patterns by kind and fuse the globs into one regex"""
+        self._dir_ignores = tuple({p[:-1] for p in self.ignore_patterns if p.endswith('/')})
+        self._substr_ignores = tuple(
+            p for p in self.ignore_patterns if not p.endswith('/') and '*' not in p
+        )
+        # Même sémantique qu'avant (search non ancré, '*' -> '.*'), compilée une seule fois
+        globs = [p.replace('*', '.*') for p in self.ignore_patterns if not p.endswith('/') and '*' in p]
+        self._glob_ignore_re = re.compile("|".join(f"(?:{g})" for g in globs)) if globs else None
+
     def _load_patterns(self) -> Dict[str, Any]:
         """Load scanning patterns"""
         # Default patterns
         patterns = {
             "aws_access_key": {
-                "pattern": r"AKIA[0-9A-Z]{16}",
+                "pattern": r"(?<![A-Za-z0-9])AKIA[0-9A-Z]{16}(?![A-Za-z0-9])",
                 "severity": "critical",
                 "description": "AWS Access Key ID"
             },
             "aws_secret_key": {
-                "pattern": r"[A-Za-z0-9/+=]{40}",
+                "pattern": r"(?<![A-Za-z0-9/+=])[A-Za-z0-9/+=]{40}(?![A-Za-z0-9/+=])",
                 "severity": "critical",
                 "description": "AWS Secret Access Key"
             },
             "github_token": {
-                "pattern": r"ghp_[A-Za-z0-9]{36}",
+                "pattern": r"(?<![A-Za-z0-9])ghp_[A-Za-z0-9]{36}(?![A-Za-z0-9])",
                 "severity": "high",
                 "description": "GitHub Personal Access Token"
             },
@@ -75,7 +203,7 @@ class SecretHawkCLI:
                 "description": "GitHub OAuth Token"
             },
             "stripe_key": {
-                "pattern": r"sk_live_[A-Za-z0-9]{24}",
+                "pattern": r"(?<![A-Za-z0-9])sk_live_[A-Za-z0-9]{24}",
                 "severity": "critical",
                 "description": "Stripe Live Secret Key"
             },
@@ -85,12 +213,12 @@ class SecretHawkCLI:
                 "description": "Stripe Live Publishable Key"
             },
             "slack_token": {
-                "pattern": r"xox[baprs]-[A-Za-z0-9-]{10,}",
+                "pattern": r"(?<![A-Za-z0-9])xox[baprs]-[A-Za-z0-9-]{10,}",
                 "severity": "high",
                 "description": "Slack Token"
             },
             "jwt_token": {
-                "pattern": r"eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*",
+                "pattern": r"(?<![A-Za-z0-9_-])eyJ[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*\.[A-Za-z0-9_-]*",
                 "severity": "medium",
                 "description": "JSON Web Token"
             },
@@ -100,22 +228,70 @@ class SecretHawkCLI:
                 "description": "Private Key"
             },
             "google_api_key": {
-                "pattern": r"AIza[0-9A-Za-z_-]{35}",
+                "pattern": r"(?<![A-Za-z0-9])AIza[0-9A-Za-z_-]{35}(?![A-Za-z0-9_-])",
                 "severity": "high",
                 "description": "Google API Key"
             }
         }
         
+        # Les règles intégrées sont couvertes par Gitleaks quand il tourne
+        for rule_config in patterns.values():
+            rule_config["source"] = "builtin"
+        
         # Try to load custom patterns
         patterns_file = "patterns.yaml"
         if os.path.exists(patterns_file):
             with open(patterns_file, 'r') as f:
                 custom = yaml.safe_load(f)
                 if custom and 'custom_patterns' in custom:
-                    patterns.update(custom['custom_patterns'])
+                    patterns.update(
+                        (rule_id, {**rule_config, "source": "custom"})
+                        for rule_id, rule_config in custom['custom_patterns'].items()
+                    )
         
         return patterns
     
+    def _compile_patterns(self):
+        """Compile rule and allowlist regexes once per run"""
+        self._rules = [
+            (rule_id, re.compile(rule_config["pattern"]),
+             rule_config.get("severity", "medium"), rule_config.get("description", ""))
+            for rule_id, rule_config in self.patterns.items()
+        ]
+
+        # Préfixe littéral de chaque règle : une règle dont le préfixe est absent du fichier
+        # ne peut pas matcher, elle sort de la présélection et de la boucle par règle
+        self._rule_prefixes = [_literal_prefix(rule_config["pattern"]) for rule_config in self.patterns.values()]
+        self._rule_prefixes_bytes = [prefix.encode() for prefix in self._rule_prefixes]
+        self._line_gates = {}
+
+        # Une seule alternation pour repérer les lignes candidates en une passe ;
+        # les règles individuelles ne tournent que sur ces lignes (matches chevauchants conservés)
+        fused = "|".join(f"(?:{rule_config['pattern']})" for rule_config in self.patterns.values())
+        try:
+            self._fused_re = re.compile(fused)
+        except re.error:
+            # Motif custom non combinable (flags inline...) : pas de présélection
+            self._fused_re = None
+
+        # Avec RE2, l'alternation est passée une seule fois sur les octets du fichier mappé
+        # (DFA linéaire, sans décodage) ; ligne par ligne, le coût d'appel de RE2 dépasse celui de re.
+        # Motifs ASCII uniquement : un motif en octets doit matcher comme sur le texte décodé
+        self._buffer_gate = None
+        gate_sources = [BOUNDARY_LOOKAROUND_RE.sub("", rule_config["pattern"]) for rule_config in self.patterns.values()]
+        gate = "|".join(f"(?:{source})" for source in gate_sources)
+        line_safe = gate.isascii() and not any(
+            token in source for source in gate_sources for token in LINE_UNSAFE_TOKENS
+        )
+        if re2 is not None and line_safe:
+            try:
+                self._buffer_gate = re2.compile(b"(?m)" + gate.encode())
+            except re2.error:
+                self._buffer_gate = None
+
+        self._allowlist_file_res = [re.compile(p) for p in self.allowlist.get("files", [])]
+        self._allowlist_secret_res = [re.compile(p) for p in self.allowlist.get("secrets", [])]
+
     def _load_allowlist(self) -> Dict[str, Any]:
         """Load allowlist configuration"""
         allowlist_file = "allowlist.yaml"
@@ -126,37 +302,27 @@ class SecretHawkCLI:
     
     def _should_ignore_file(self, file_path: str) -> bool:
         """Check if file should be ignored"""
-        for pattern in self.ignore_patterns:
-            if pattern.endswith('/'):
-                # Directory pattern
-                if pattern[:-1] in file_path:
-                    return True
-            elif '*' in pattern:
-                # Glob pattern (basic implementation)
-                regex_pattern = pattern.replace('*', '.*')
-                if re.search(regex_pattern, os.path.basename(file_path)):
-                    return True
-            else:
-                # Exact match
-                if pattern in file_path:
-                    return True
-        return False
+        # Directory patterns, then exact (substring) matches
+        for pattern in self._dir_ignores:
+            if pattern in file_path:
+                return True
+        for pattern in self._substr_ignores:
+            if pattern in file_path:
+                return True
+        # Glob patterns (basic implementation)
+        glob_re = self._glob_ignore_re
+        return glob_re is not None and glob_re.search(os.path.basename(file_path)) is not None
     
-    def _is_in_allowlist(self, finding: Dict[str, Any]) -> bool:
+    def _is_in_allowlist(self, finding: Finding) -> bool:
         """Check if finding should be ignored"""
-        if not self.allowlist:
-            return False
-        
         # Check file patterns
-        file_patterns = self.allowlist.get("files", [])
-        for pattern in file_patterns:
-            if re.search(pattern, finding["file"]):
+        for regex in self._allowlist_file_res:
+            if regex.search(finding.file):
                 return True
         
         # Check secret patterns
-        secret_patterns = self.allowlist.get("secrets", [])
-        for pattern in secret_patterns:
-            if re.search(pattern, finding["secret"]):
+        for regex in self._allowlist_secret_res:
+            if regex.search(finding.secret):
                 return True
         
         return False
@@ -167,135 +333,268 @@ class SecretHawkCLI:
             return "*" * len(secret)
         return f"{secret[:4]}{'*' * (len(secret) - 8)}{secret[-4:]}"
     
-    def _scan_file_with_regex(self, file_path: str) -> List[Dict[str, Any]]:
+    def _gate_mapped_file(self, mm: mmap.mmap) -> List[tuple]:
+        """(line_index, line) for each line of the mapped file hit by the buffer gate"""
+        candidates = []
+        line_index = 0
+        pos = 0
+        last_index = -1
+        for match in self._buffer_gate.finditer(mm):
+            start = match.start()
+            line_index += mm[pos:start].count(b"\n")
+            pos = start
+            if line_index == last_index:
+                continue
+            last_index = line_index
+            # Seule la ligne candidate est décodée, comme l'aurait fait readlines()
+            line_start = mm.rfind(b"\n", 0, start) + 1
+            line_end = mm.find(b"\n", start)
+            raw = mm[line_start:] if line_end == -1 else mm[line_start:line_end + 1]
+            line = raw.decode("utf-8", errors="ignore")
+            if line.endswith("\r\n"):
+                line = line[:-2] + "\n"
+            candidates.append((line_index, line))
+        return candidates
+
+    def _looks_binary(self, file_path: str) -> bool:
+        """Sniff the file head for NUL bytes or a high ratio of control bytes"""
+        with open(file_path, 'rb') as f:
+            head = f.read(BINARY_SNIFF_SIZE)
+        if b"\x00" in head:
+            return True
+        return len(head.translate(None, TEXT_BYTES)) > len(head) * BINARY_CONTROL_RATIO
+
+    def _line_gate(self, survivors: Tuple[int, ...]):
+        """Fused regex over the surviving rules only, compiled once per rule subset"""
+        if len(survivors) == len(self._rules):
+            return self._fused_re
+        try:
+            return self._line_gates[survivors]
+        except KeyError:
+            pass
+        fused = "|".join(f"(?:{self._rules[index][1].pattern})" for index in survivors)
+        try:
+            gate = re.compile(fused)
+        except re.error:
+            gate = None
+        self._line_gates[survivors] = gate
+        return gate
+
+    def _candidate_lines(self, file_path: str, size: Optional[int] = None) -> Tuple[List[tuple], List[tuple]]:
+        """Rules that can match the file, and the (line_index, line) pairs that may hold a match"""
+        if size is None:
+            size = os.path.getsize(file_path)
+        if self._buffer_gate is not None and size >= MMAP_MIN_SIZE:
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Un '\r' isolé compte comme fin de ligne en mode texte : on garde alors la lecture texte
+                if mm.find(b"\r") == -1 or LONE_CR_RE.search(mm) is None:
+                    survivors = [
+                        rule for rule, prefix in zip(self._rules, self._rule_prefixes_bytes)
+                        if not prefix or mm.find(prefix) != -1
+                    ]
+                    if not survivors:
+                        return survivors, []
+                    return survivors, self._gate_mapped_file(mm)
+
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+
+        survivors = tuple(
+            index for index, prefix in enumerate(self._rule_prefixes)
+            if not prefix or prefix in content
+        )
+        rules = [self._rules[index] for index in survivors]
+        if not rules:
+            return rules, []
+
+        # Découpage identique à readlines() (le texte est déjà en newlines universels)
+        lines = io.StringIO(content).readlines()
+        line_gate = self._line_gate(survivors)
+        if line_gate is None:
+            return rules, list(enumerate(lines))
+        return rules, [(index, line) for index, line in enumerate(lines) if line_gate.search(line) is not None]
+
+    def _scan_file_with_regex(self, file_path: str, size: Optional[int] = None) -> List[Finding]:
         """Scan file with regex patterns"""
         findings = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-                
-                for line_no, line in enumerate(lines, 1):
-                    for rule_id, rule_config in self.patterns.items():
-                        pattern = rule_config["pattern"]
-                        matches = re.finditer(pattern, line)
+            rules, candidates = self._candidate_lines(file_path, size)
+            for index, line in candidates:
+                for rule_id, regex, severity, description in rules:
+                    for match in regex.finditer(line):
+                        secret = match.group()
+                        finding = Finding(
+                            file_path, index + 1, rule_id, secret,
+                            self._redact_secret(secret), severity, description, "regex"
+                        )
                         
-                        for match in matches:
-                            finding = {
-                                "file": file_path,
-                                "line": line_no,
-                                "type": rule_id,
-                                "secret": match.group(),
-                                "secret_redacted": self._redact_secret(match.group()),
-                                "severity": rule_config.get("severity", "medium"),
-                                "description": rule_config.get("description", ""),
-                                "scanner": "regex"
-                            }
-                            
-                            if not self._is_in_allowlist(finding):
-                                findings.append(finding)
+                        if not self._is_in_allowlist(finding):
+                            findings.append(finding)
         
         except Exception as e:
             print(f"Error scanning {file_path}: {e}")
         
         return findings
     
-    def _run_gitleaks(self, directory: str) -> List[Dict[str, Any]]:
+    def _run_gitleaks(self, directory: str) -> List[Finding]:
         """Run Gitleaks scanner"""
-        findings = []
-        
-        try:
-            # Create temporary output file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-                temp_output = temp_file.name
-            
-            # Run gitleaks
-            cmd = [
-                "gitleaks", "detect",
-                "--source", directory,
-                "--report-path", temp_output,
-                "--report-format", "json",
-                "--no-git"
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Read results
-            if os.path.exists(temp_output):
-                try:
-                    with open(temp_output, 'r') as f:
-                        content = f.read().strip()
-                        if content:
-                            gitleaks_results = json.loads(content)
-                            
-                            for item in gitleaks_results:
-                                finding = {
-                                    "file": item.get("File", ""),
-                                    "line": item.get("StartLine", 0),
-                                    "type": item.get("RuleID", "unknown"),
-                                    "secret": item.get("Secret", ""),
-                                    "secret_redacted": self._redact_secret(item.get("Secret", "")),
-                                    "severity": self._map_gitleaks_severity(item.get("RuleID", "")),
-                                    "description": item.get("Description", ""),
-                                    "scanner": "gitleaks"
-                                }
-                                findings.append(finding)
-                except json.JSONDecodeError:
-                    pass
-                
-                # Cleanup
-                os.unlink(temp_output)
-        
-        except FileNotFoundError:
-            print("Warning: Gitleaks not found. Install from https://github.com/trufflesecurity/gitleaks")
-        except Exception as e:
-            print(f"Gitleaks scan failed: {e}")
-        
-        return findings
+        return [
+            Finding(
+                file=item["file"],
+                line=item["line"],
+                type=item["type"],
+                secret=item["secret"],
+                secret_redacted=self._redact_secret(item["secret"]),
+                severity=self._map_gitleaks_severity(item["type"]),
+                description=item["description"],
+                scanner="gitleaks"
+            )
+            for item in self._gitleaks.scan_directory(directory)
+        ]
     
     def _map_gitleaks_severity(self, rule_id: str) -> str:
         """Map Gitleaks rules to severity levels"""
-        critical_rules = ["aws-access-token", "aws-secret-key", "stripe-access-token"]
-        high_rules = ["github-pat", "gitlab-pat", "slack-bot-token"]
-        
-        if any(critical in rule_id.lower() for critical in critical_rules):
-            return "critical"
-        elif any(high in rule_id.lower() for high in high_rules):
-            return "high"
-        else:
-            return "medium"
+        return _gitleaks_severity_for_rule(rule_id.lower())
     
-    def scan_directory(self, directory: str) -> List[Dict[str, Any]]:
+    def scan_directory(self, directory: str, use_gitleaks: bool = True) -> List[Finding]:
         """Scan directory for secrets"""
         print(f"🔍 Scanning directory: {directory}")
         
         all_findings = []
         files_scanned = 0
+        rule_scanner = self
         
         # Run Gitleaks if available
-        print("📊 Running Gitleaks scanner...")
-        gitleaks_findings = self._run_gitleaks(directory)
-        all_findings.extend(gitleaks_findings)
+        if use_gitleaks:
+            print("📊 Running Gitleaks scanner...")
+            gitleaks_findings = self._run_gitleaks(directory)
+            all_findings.extend(gitleaks_findings)
+
+            # Gitleaks a couvert les règles intégrées : seules les règles custom restent à passer
+            if self._gitleaks.last_scan_ok:
+                custom_patterns = {
+                    rule_id: rule_config for rule_id, rule_config in self.patterns.items()
+                    if rule_config.get("source") == "custom"
+                }
+                rule_scanner = self._rule_scanner(custom_patterns, self.allowlist) if custom_patterns else None
         
         # Run regex scan
-        print("🔎 Running regex scanner...")
-        for root, dirs, files in os.walk(directory):
-            for file in files:
-                file_path = os.path.join(root, file)
-                
-                if self._should_ignore_file(file_path):
+        if rule_scanner is None:
+            print("🔎 Built-in rules covered by Gitleaks, no custom patterns to run")
+        else:
+            print("🔎 Running regex scanner...")
+            for findings in rule_scanner._scan_files(self._iter_candidates(directory)):
+                if findings is None:
                     continue
-                
-                if self._should_scan_file(file):
-                    findings = self._scan_file_with_regex(file_path)
-                    all_findings.extend(findings)
-                    files_scanned += 1
+                all_findings.extend(findings)
+                files_scanned += 1
         
         print(f"✅ Scanned {files_scanned} files")
         print(f"🚨 Found {len(all_findings)} potential secrets")
         
         return all_findings
     
+    @classmethod
+    def _rule_scanner(cls, patterns: Dict[str, Any], allowlist: Dict[str, Any]) -> "SecretHawkCLI":
+        """Scanner carrying only compiled rules (no ignore list, no Gitleaks)"""
+        scanner = cls.__new__(cls)
+        scanner.patterns = patterns
+        scanner.allowlist = allowlist
+        scanner._compile_patterns()
+        return scanner
+
+    def _iter_files(self, directory: str):
+        """Yield file DirEntries in os.walk order, without descending into ignored directories"""
+        # Les motifs répertoire / sous-chaîne présents dans le chemin d'un dossier le sont
+        # aussi dans celui de tous ses fichiers : inutile d'y descendre
+        prune = self._dir_ignores + self._substr_ignores
+        stack = [directory]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry
+                elif not entry.is_symlink() and not any(p in entry.path for p in prune):
+                    subdirs.append(entry.path)
+            stack.extend(reversed(subdirs))
+
+    def _iter_candidates(self, directory: str) -> Iterator[Tuple[str, Optional[int]]]:
+        """Yield (path, size) for each file to scan, in walk order"""
+        for entry in self._iter_files(directory):
+            file_path = entry.path
+            
+            if self._should_ignore_file(file_path):
+                continue
+            
+            if self._should_scan_file(entry.name):
+                try:
+                    size = entry.stat().st_size
+                except OSError:
+                    # Lien cassé... : _scan_candidate refait le stat et signale l'erreur
+                    size = None
+                yield file_path, size
+
+    def _scan_candidate(self, file_path: str, size: Optional[int] = None) -> Optional[List[Finding]]:
+        """Scan one file, or return None when it is skipped (binary or too large)"""
+        # Un seul stat par fichier : la taille sert aussi au choix mmap / lecture texte
+        try:
+            if size is None:
+                size = os.stat(file_path).st_size
+            if size > MAX_SCAN_FILE_SIZE or self._looks_binary(file_path):
+                return None
+        except OSError as e:
+            print(f"Error scanning {file_path}: {e}")
+            return None
+
+        return self._scan_file_with_regex(file_path, size)
+
+    def _scan_files(self, candidates: Iterator[Tuple[str, Optional[int]]]):
+        """Yield per-file results in walk order, overlapping the walk with the scan"""
+        workers = os.cpu_count() or 1
+        if workers > 1:
+            # Les premiers fichiers sont parcourus en direct : le pool n'est créé (et les
+            # workers forkés) que si l'arbre est assez gros
+            head = list(itertools.islice(candidates, PARALLEL_MIN_FILES))
+            if len(head) < PARALLEL_MIN_FILES:
+                for candidate in head:
+                    yield self._scan_candidate(*candidate)
+                return
+
+            try:
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_scan_worker,
+                    initargs=(self.patterns, self.allowlist),
+                )
+                first = executor.submit(_scan_file_worker, head[0])
+            except (OSError, NotImplementedError) as e:
+                # Pas de multiprocessing disponible (sandbox, /dev/shm absent...) : scan séquentiel
+                print(f"⚠️  Parallel scan unavailable ({e}), scanning sequentially")
+                candidates = itertools.chain(head, candidates)
+            else:
+                # map() soumet au fil du parcours : les workers scannent pendant que l'on marche
+                with executor:
+                    rest = executor.map(
+                        _scan_file_worker, itertools.chain(head[1:], candidates), chunksize=PARALLEL_CHUNK_SIZE
+                    )
+                    yield first.result()
+                    yield from rest
+                return
+
+        for candidate in candidates:
+            yield self._scan_candidate(*candidate)
+
     def _should_scan_file(self, filename: str) -> bool:
         """Check if file should be scanned"""
         # Extensions à ignorer
@@ -325,67 +624,84 @@ class SecretHawkCLI:
         return ext not in skip_extensions and base not in skip_files
 
     
-    def display_findings(self, findings: List[Dict[str, Any]]):
+    def display_findings(self, findings: List[Finding]):
         """Display findings in a readable format"""
         if not findings:
             print("✅ No secrets found!")
             return
         
-        # Group by severity
-        by_severity = {}
+        # Group by severity (single pass)
+        by_severity = defaultdict(list)
         for finding in findings:
-            severity = finding["severity"]
-            if severity not in by_severity:
-                by_severity[severity] = []
-            by_severity[severity].append(finding)
+            by_severity[finding.severity].append(finding)
         
         # Display summary
         print("\n📊 Summary:")
-        for severity in ["critical", "high", "medium", "low"]:
+        for severity in SEVERITY_ORDER:
             count = len(by_severity.get(severity, []))
             if count > 0:
-                emoji = {"critical": "🔴", "high": "🟠", "medium": "🟡", "low": "🔵"}
-                print(f"  {emoji.get(severity, '⚪')} {severity.title()}: {count}")
+                print(f"  {SEVERITY_EMOJI.get(severity, '⚪')} {severity.title()}: {count}")
         
-        # Display detailed findings
+        # Display detailed findings, one write per severity bucket
         print("\n🔍 Detailed Findings:")
-        for severity in ["critical", "high", "medium", "low"]:
+        write = sys.stdout.write
+        for severity in SEVERITY_ORDER:
             severity_findings = by_severity.get(severity, [])
             if severity_findings:
-                print(f"\n{severity.upper()} FINDINGS:")
+                lines = [f"\n{severity.upper()} FINDINGS:\n"]
                 for finding in severity_findings:
-                    print(f"  📄 File: {finding['file']}:{finding['line']}")
-                    print(f"  🏷️  Type: {finding['type']}")
-                    print(f"  🔒 Secret: {finding['secret_redacted']}")
-                    print(f"  📝 Description: {finding.get('description', 'N/A')}")
-                    print(f"  🔧 Scanner: {finding['scanner']}")
-                    print()
+                    lines.append(
+                        f"  📄 File: {finding.file}:{finding.line}\n"
+                        f"  🏷️  Type: {finding.type}\n"
+                        f"  🔒 Secret: {finding.secret_redacted}\n"
+                        f"  📝 Description: {finding.description}\n"
+                        f"  🔧 Scanner: {finding.scanner}\n\n"
+                    )
+                write("".join(lines))
     
-    def export_findings(self, findings: List[Dict[str, Any]], output_file: str):
+    def export_findings(self, findings: List[Finding], output_file: str):
         """Export findings to JSON file"""
         output_data = {
             "scan_timestamp": str(os.path.getctime('.')),
             "total_findings": len(findings),
-            "summary": {},
+            "summary": dict(Counter(finding.severity for finding in findings)),
             "findings": findings
         }
         
-        # Create summary
-        for finding in findings:
-            severity = finding["severity"]
-            output_data["summary"][severity] = output_data["summary"].get(severity, 0) + 1
-        
-        with open(output_file, 'w') as f:
-            json.dump(output_data, f, indent=2)
+        if orjson is not None:
+            # orjson sérialise les dataclasses (slots compris) nativement
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+        else:
+            # json.dump avec indent passe par l'encodeur Python pur
+            output_data["findings"] = [asdict(finding) for finding in findings]
+            with open(output_file, 'w') as f:
+                json.dump(output_data, f, indent=2)
         
         print(f"📁 Results exported to: {output_file}")
 
+# Scanner propre à chaque process worker, compilé une seule fois par l'initializer
+_worker_scanner = None
+
+
+def _init_scan_worker(patterns: Dict[str, Any], allowlist: Dict[str, Any]):
+    """Build the per-process scanner from the parent's rules"""
+    global _worker_scanner
+    _worker_scanner = SecretHawkCLI._rule_scanner(patterns, allowlist)
+
+
+def _scan_file_worker(candidate: Tuple[str, Optional[int]]) -> Optional[List[Finding]]:
+    return _worker_scanner._scan_candidate(*candidate)
+
+
 def main():
     parser = argparse.ArgumentParser(description="SecretHawk CLI - Local secret scanner")
     parser.add_argument("command", choices=["scan"], help="Command to run")
     parser.add_argument("directory", help="Directory to scan")
     parser.add_argument("--output", "-o", help="Output JSON file")
     parser.add_argument("--patterns", help="Custom patterns YAML file")
+    parser.add_argument("--no-gitleaks", action="store_true",
+                        help="Skip Gitleaks and run every rule with the built-in regex scanner")
     
     args = parser.parse_args()
     
@@ -396,7 +712,7 @@ def main():
             print(f"Error: Directory '{args.directory}' does not exist")
             sys.exit(1)
         
-        findings = scanner.scan_directory(args.directory)
+        findings = scanner.scan_directory(args.directory, use_gitleaks=not args.no_gitleaks)
         scanner.display_findings(findings)
         
         if args.output:
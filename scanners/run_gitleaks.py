@@ -6,78 +6,211 @@ Gitleaks scanner wrapper for SecretHawk
 import subprocess
 import json
 import os
+import re
+import shutil
 import tempfile
-from typing import List, Dict, Any
+import threading
+from functools import lru_cache
+from typing import List, Dict, Any, BinaryIO, Iterable, Iterator
+
+try:
+    import ijson  # optionnel : lecture du rapport en flux, mémoire constante
+except ImportError:
+    ijson = None
+
+GITLEAKS_TIMEOUT = 300
+# Rapport lu directement sur le stdout de Gitleaks ; Windows n'a pas /dev/stdout
+STREAM_REPORT = os.name != "nt"
+
+CRITICAL_PATTERNS = (
+    "aws-access-key", "aws-secret-access-key", "gcp-service-account",
+    "stripe-access-token", "private-key", "rsa-private-key"
+)
+
+HIGH_PATTERNS = (
+    "github-token", "gitlab-token", "slack-token",
+    "discord-token", "telegram-token"
+)
+
+MEDIUM_PATTERNS = (
+    "jwt", "generic-api-key", "url-secret"
+)
+
+# Une alternation par niveau, testée dans l'ordre de priorité (une alternation unique
+# renverrait le match le plus à gauche, pas le plus sévère)
+SEVERITY_LEVELS = tuple(
+    (re.compile("|".join(re.escape(p) for p in patterns)), severity)
+    for patterns, severity in (
+        (CRITICAL_PATTERNS, "critical"),
+        (HIGH_PATTERNS, "high"),
+        (MEDIUM_PATTERNS, "medium"),
+    )
+)
+
+
+@lru_cache(maxsize=None)
+def _severity_for_rule(rule_lower: str) -> str:
+    # Gitleaks a un jeu de règles fini : chaque RuleID n'est classé qu'une fois
+    for regex, severity in SEVERITY_LEVELS:
+        if regex.search(rule_lower):
+            return severity
+    return "low"
 
 class GitleaksScanner:
-    def __init__(self, gitleaks_path: str = "gitleaks"):
+    def __init__(self, gitleaks_path: str = "gitleaks", no_git: bool = False):
         self.gitleaks_path = gitleaks_path
+        self.no_git = no_git
+        # Résolu une fois : pas de fork+exec par scan si le binaire est absent
+        self._gitleaks_bin = shutil.which(gitleaks_path)
         self.config_file = os.path.join("scanners", "gitleaks.toml")
+        # Vrai seulement si le dernier scan a produit un rapport lisible en entier
+        self.last_scan_ok = False
     
     def scan_directory(self, directory: str) -> List[Dict[str, Any]]:
         """Run Gitleaks scan on directory"""
         findings: List[Dict[str, Any]] = []
+        self.last_scan_ok = False
 
-        try:
-            # Crée un fichier temporaire pour le rapport
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
-                temp_output = temp_file.name
-
-            # Construire la commande Gitleaks
-            cmd = [
-                self.gitleaks_path,
-                "detect",
-                "--source", directory,
-                "--report-path", temp_output,
-                "--report-format", "json",
-                "--verbose"
-            ]
-
-            # Ajouter la config si elle existe
-            if os.path.exists(self.config_file):
-                cmd.extend(["--config", self.config_file])
-
-            # Exécuter Gitleaks
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-
-            # Logs pour debug
-            if result.stdout:
-                print("Gitleaks stdout:\n", result.stdout)
-            if result.stderr:
-                print("Gitleaks stderr:\n", result.stderr)
-
-            # Lire les résultats JSON
-            if os.path.exists(temp_output):
-                with open(temp_output, 'r') as f:
-                    content = f.read().strip()
-                    if content:
-                        try:
-                            gitleaks_results = json.loads(content)
-                            findings = self._parse_results(gitleaks_results)
-                        except json.JSONDecodeError:
-                            print(f"Failed to parse Gitleaks output: {content}")
+        if self._gitleaks_bin is None:
+            print("Gitleaks not found. Please install from https://github.com/trufflesecurity/gitleaks")
+            return findings
 
-                # Supprimer le fichier temporaire
-                os.unlink(temp_output)
+        try:
+            if STREAM_REPORT:
+                findings = self._scan_streaming(directory)
+            else:
+                findings = self._scan_with_report_file(directory)
 
         except subprocess.TimeoutExpired:
+            self.last_scan_ok = False
             print("Gitleaks scan timed out")
         except FileNotFoundError:
+            self.last_scan_ok = False
             print("Gitleaks not found. Please install from https://github.com/trufflesecurity/gitleaks")
         except Exception as e:
+            self.last_scan_ok = False
             print(f"Gitleaks scan failed: {e}")
 
         return findings
 
-    def _parse_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Parse Gitleaks results into standard format"""
+    def _build_command(self, directory: str, report_path: str, verbose: bool = True) -> List[str]:
+        # Construire la commande Gitleaks
+        cmd = [
+            self._gitleaks_bin,
+            "detect",
+            "--source", directory,
+            "--report-path", report_path,
+            "--report-format", "json",
+            "--no-banner"
+        ]
+        if self.no_git:
+            cmd.append("--no-git")
+        if verbose:
+            cmd.extend(["--verbose", "--no-color"])
+
+        # Ajouter la config si elle existe
+        if os.path.exists(self.config_file):
+            cmd.extend(["--config", self.config_file])
+
+        return cmd
+
+    def _scan_streaming(self, directory: str) -> List[Dict[str, Any]]:
+        """Parse the report from Gitleaks' stdout while it runs, without a temp file"""
+        # Pas de --verbose : stdout ne doit contenir que le rapport JSON
+        cmd = self._build_command(directory, "/dev/stdout", verbose=False)
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        # stderr est vidé en parallèle pour que Gitleaks ne bloque jamais sur un pipe plein
+        stderr_chunks: List[bytes] = []
+        drain = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+        drain.start()
+
+        timed_out = threading.Event()
+        def _kill():
+            timed_out.set()
+            process.kill()
+        timer = threading.Timer(GITLEAKS_TIMEOUT, _kill)
+        timer.start()
+
+        try:
+            findings = self._read_stream(process.stdout)
+        finally:
+            process.stdout.close()
+            process.wait()
+            timer.cancel()
+            drain.join()
+
+        # Logs pour debug
+        stderr = b"".join(stderr_chunks).decode(errors="replace")
+        if stderr:
+            print("Gitleaks stderr:\n", stderr)
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, GITLEAKS_TIMEOUT)
+
+        return findings
+
+    def _scan_with_report_file(self, directory: str) -> List[Dict[str, Any]]:
+        """Fallback for platforms without /dev/stdout: report written to a temp file"""
         findings: List[Dict[str, Any]] = []
 
+        # Crée un fichier temporaire pour le rapport
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as temp_file:
+            temp_output = temp_file.name
+
+        # Exécuter Gitleaks
+        result = subprocess.run(
+            self._build_command(directory, temp_output),
+            capture_output=True,
+            text=True,
+            timeout=GITLEAKS_TIMEOUT
+        )
+
+        # Logs pour debug
+        if result.stdout:
+            print("Gitleaks stdout:\n", result.stdout)
+        if result.stderr:
+            print("Gitleaks stderr:\n", result.stderr)
+
+        # Lire les résultats JSON
+        if os.path.exists(temp_output):
+            try:
+                with open(temp_output, 'rb') as f:
+                    findings = self._read_stream(f)
+            finally:
+                # Supprimer le fichier temporaire
+                os.unlink(temp_output)
+
+        return findings
+
+    def _read_stream(self, stream: BinaryIO) -> List[Dict[str, Any]]:
+        """Read a Gitleaks JSON report, item by item when ijson is available"""
+        findings: List[Dict[str, Any]] = []
+
+        if ijson is None:
+            content = stream.read().decode(errors="replace").strip()
+            if content:
+                try:
+                    findings.extend(self._parse_results(json.loads(content)))
+                    self.last_scan_ok = True
+                except json.JSONDecodeError:
+                    print(f"Failed to parse Gitleaks output: {content}")
+            return findings
+
+        # Rapport vide (Gitleaks en erreur) : rien à parser
+        if not stream.peek(1):
+            return findings
+
+        try:
+            findings.extend(self._parse_results(ijson.items(stream, 'item', use_float=True)))
+            self.last_scan_ok = True
+        except ijson.JSONError as e:
+            print(f"Failed to parse Gitleaks output: {e}")
+
+        return findings
+
+    def _parse_results(self, results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Parse Gitleaks results into standard format"""
         for item in results:
             finding = {
                 "file": item.get("File", ""),
@@ -93,36 +226,11 @@ class GitleaksScanner:
                 "date": item.get("Date", ""),
                 "scanner": "gitleaks"
             }
-            findings.append(finding)
-
-        return findings
+            yield finding
 
     def _map_severity(self, rule_id: str) -> str:
         """Map Gitleaks rules to severity levels"""
-        critical_patterns = [
-            "aws-access-key", "aws-secret-access-key", "gcp-service-account",
-            "stripe-access-token", "private-key", "rsa-private-key"
-        ]
-
-        high_patterns = [
-            "github-token", "gitlab-token", "slack-token",
-            "discord-token", "telegram-token"
-        ]
-
-        medium_patterns = [
-            "jwt", "generic-api-key", "url-secret"
-        ]
-
-        rule_lower = rule_id.lower()
-
-        if any(pattern in rule_lower for pattern in critical_patterns):
-            return "critical"
-        elif any(pattern in rule_lower for pattern in high_patterns):
-            return "high"
-        elif any(pattern in rule_lower for pattern in medium_patterns):
-            return "medium"
-        else:
-            return "low"
+        return _severity_for_rule(rule_id.lower())
 
 
 if __name__ == "__main__":
@@ -5,11 +5,251 @@ Regex-based scanner for SecretHawk
 
 import re
 import os
-from typing import List, Dict, Any, Pattern
+import itertools
+import math
+import mmap
+import threading
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from heapq import merge
+from typing import List, Dict, Any, Iterator, Pattern, Optional, Set, Tuple
+
+try:
+    import hyperscan  # optionnel : toutes les règles évaluées en une seule passe
+except ImportError:
+    hyperscan = None
+
+# En dessous de cette taille, un read() coûte moins cher que le mapping
+MMAP_MIN_SIZE = 4096
+
+# Bundles minifiés, lockfiles, assets : au-delà, que des faux positifs high_entropy
+MAX_SCAN_FILE_SIZE = 2 * 1024 * 1024
+# Un NUL dans la tête du fichier suffit à le classer binaire
+BINARY_SNIFF_SIZE = 8192
+# Sinon, plus de 30 % d'octets de contrôle dans les premiers 512 octets
+BINARY_CONTROL_SNIFF_SIZE = 512
+BINARY_CONTROL_RATIO = 0.3
+# Octets "texte" (tout sauf NUL..\b et \x0e..\x1f), supprimés par translate() pour compter le reste
+TEXT_BYTES = bytes(b for b in range(256) if not (b < 9 or 13 < b < 32))
+
+# En dessous, le coût du fork et de la compilation par worker dépasse le gain
+PARALLEL_MIN_FILES = 64
+PARALLEL_CHUNK_SIZE = 32
+
+# Ce que `\s` accepte en plus dans un motif `re` str : séparateurs \x1c-\x1f et
+# espaces Unicode, dont les octets UTF-8 sont tous >= 0x80
+HS_EXTRA_SPACE = r"\x1c-\x1f\x80-\xff"
+
+# Expression témoin ajoutée à la base : un fichier brut sans octet >= 0x80 ni '\r'
+# est identique à son texte décodé, les offsets Hyperscan valent alors pour lui
+HS_UNCLEAN_EXPRESSION = rb"[\x80-\xff\r]"
+HS_UNCLEAN_ID = 1 << 16
+
+# Tête de motif sans effet sur l'existence d'un match dans la ligne : `\b` ou
+# classe optionnelle. Retirée de l'alternation, `re` retrouve son préfiltre
+# sur le premier caractère au lieu de tester chaque branche à chaque position
+GATE_OPTIONAL_HEAD_RE = re.compile(r"^(?:\\b|\[[^\]]*\]\?)+")
+
+# Placeholders et exemples, en une seule alternation ancrée par match() ;
+# IGNORECASE remplace le match.lower() de chaque appel
+FALSE_POSITIVE_RE = re.compile(
+    r"(?:example|test|demo|placeholder|fake|dummy|sample)"
+    r"|x{8,}$"            # All x's
+    r"|\*{8,}$"           # All asterisks
+    r"|0{8,}$"            # All zeros
+    r"|1{8,}$"            # All ones
+    r"|(?:your|my|our)[-_]?(?:secret|key|token)"
+    r"|\$\{.*\}$"         # Environment variable placeholder
+    r"|<.*>$",            # XML/HTML placeholder
+    re.IGNORECASE,
+)
+
+# Seuil de Shannon sous lequel une chaîne base64 est un identifiant, un nom de
+# fichier hashé ou un token minifié, pas un secret. Relatif au maximum possible,
+# log2(min(longueur, 64)) bits/caractère : un seuil fixe de 4.5 bits rejetait
+# ~30 % des vrais secrets aléatoires de 32 caractères (5 bits au plus). Un
+# secret aléatoire atteint ~0.8 de ce maximum quelle que soit sa longueur, et à
+# partir de 64 caractères le seuil retombe sur les 4.5 bits d'origine
+HIGH_ENTROPY_MIN_RATIO = 0.75
+
+# Entre deux matches qui se chevauchent (aws_secret_key et high_entropy sur la
+# même chaîne...), seul le plus sévère est gardé
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+PREFIX_STOP_CHARS = frozenset(".^$*+?{}[]|()")
+PREFIX_OPTIONAL_QUANTIFIERS = frozenset("?*{")
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Literal text every match of the pattern starts with ('' when there is none)"""
+    source = GATE_OPTIONAL_HEAD_RE.sub("", pattern)
+    if "|" in source or "(?" in source:
+        # Alternation, groupes ou flags inline : on ne devine pas
+        return ""
+
+    prefix = []
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            escaped = source[i + 1:i + 2]
+            if not escaped or escaped.isalnum():
+                # \d, \s, \b... : classe ou assertion, pas un littéral
+                break
+            literal, step = escaped, 2
+        elif char in PREFIX_STOP_CHARS:
+            break
+        else:
+            literal, step = char, 1
+        if source[i + step:i + step + 1] in PREFIX_OPTIONAL_QUANTIFIERS:
+            break
+        prefix.append(literal)
+        i += step
+    return "".join(prefix)
+
+
+def _bytes_expression(source: str, keep_boundaries: bool = False) -> bytes:
+    r"""Translate a `re` str pattern into a bytes pattern that never misses a match.
+
+    Bytes engines (Hyperscan, bytes `re`) use ASCII classes while str patterns
+    use Unicode ones: `\s` also accepts non-ASCII bytes and `\b` is dropped,
+    unless the buffer is known to be pure ASCII (keep_boundaries), where both
+    agree on it and the translation matches exactly like the source.
+    """
+    out = []
+    in_class = False
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            escape = source[i:i + 2]
+            i += 2
+            if escape == r"\b" and not in_class and not keep_boundaries:
+                continue
+            if escape == r"\s":
+                escape = r"\s" + HS_EXTRA_SPACE if in_class else r"[\s" + HS_EXTRA_SPACE + "]"
+            out.append(escape)
+            continue
+        if char == "[" and not in_class:
+            in_class = True
+        elif char == "]" and in_class:
+            in_class = False
+        out.append(char)
+        i += 1
+    return "".join(out).encode()
+
+
+def _newline_offsets(data):
+    """Offsets of every newline in a str or bytes buffer, in increasing order"""
+    sep = '\n' if isinstance(data, str) else b'\n'
+    offsets = []
+    idx = data.find(sep)
+    while idx != -1:
+        offsets.append(idx)
+        idx = data.find(sep, idx + 1)
+    return offsets
+
+
+def _shannon_entropy(text: str) -> float:
+    """Shannon entropy of the string, in bits per character"""
+    length = len(text)
+    return sum(count / length * math.log2(length / count) for count in Counter(text).values())
+
+
+def _read_fd(fd: int, size: int) -> bytes:
+    """Read the first `size` bytes of the file, in a single read() for regular files"""
+    data = os.read(fd, size)
+    if len(data) == size:
+        return data
+    # Lecture partielle (FS réseau, fichier tronqué entre-temps...) : on complète
+    # jusqu'à `size` ou EOF
+    chunks = [data]
+    remaining = size - len(data)
+    while remaining > 0:
+        chunk = os.read(fd, remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _decode_text(data: bytes) -> str:
+    """Same text as open(..., 'r', encoding='utf-8', errors='ignore').read()"""
+    text = data.decode('utf-8', errors='ignore')
+    if '\r' in text:
+        # Retours à la ligne universels du mode texte
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+@dataclass
+class Finding:
+    """A single regex hit; converted to a dict only at the output boundary"""
+    # __slots__ explicite plutôt que dataclass(slots=True) : la CI tourne encore en 3.9
+    __slots__ = ("file", "line", "column", "type", "secret", "severity", "description", "scanner")
+
+    file: str
+    line: int
+    column: int
+    type: str
+    secret: str
+    severity: str
+    description: str
+    scanner: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class RegexScanner:
-    def __init__(self):
+    # Règles laissées à `re` sans tenter Hyperscan (lookarounds, backrefs...) :
+    # aucune aujourd'hui, _bytes_expression couvre les motifs actuels
+    HS_INCOMPATIBLE = frozenset()
+
+    # Construits une fois au chargement, pas à chaque entrée de répertoire
+    SKIP_DIRS = frozenset({
+        '.git', 'node_modules', '__pycache__', '.pytest_cache',
+        'vendor', 'dist', 'build', '.venv', 'venv',
+        '.tox', '.coverage', '.mypy_cache'
+    })
+
+    # Formats toujours binaires, écartés sans même ouvrir le fichier. Ceux qui
+    # peuvent être du texte (.svg, .pdf non compressé...) passent par le sniff
+    # de contenu de scan_file, comme les binaires déguisés en .txt
+    SKIP_EXTENSIONS = frozenset({
+        '.jpg', '.jpeg', '.png', '.gif', '.bmp',
+        '.zip', '.tar', '.gz', '.rar', '.7z',
+        '.exe', '.dll', '.so', '.dylib',
+        '.doc', '.docx', '.xls', '.xlsx',
+        '.mp3', '.mp4', '.avi', '.mov', '.wav',
+        '.pyc', '.pyo', '.class', '.o', '.obj'
+    })
+
+    def __init__(self, max_size: int = MAX_SCAN_FILE_SIZE, fail_fast: bool = False):
+        self.max_size = max_size
+        # Hook pre-commit / CI : le scan s'arrête au premier secret critique, dans
+        # le fichier (scan_file) comme dans l'arbre (scan_directory)
+        self.fail_fast = fail_fast
         self.patterns = self._load_patterns()
+        # Listes parallèles indexées par numéro de règle (= id Hyperscan) : pas de
+        # dict de dicts à déréférencer dans la boucle de scan
+        self._rule_ids = list(self.patterns)
+        self._compiled = [rule_config["pattern"] for rule_config in self.patterns.values()]
+        self._severities = [rule_config["severity"] for rule_config in self.patterns.values()]
+        self._descriptions = [rule_config["description"] for rule_config in self.patterns.values()]
+        self._hs_db, self._hs_text_db, self._fallback_rules = self._compile_hyperscan()
+        # Scratch Hyperscan par thread, alloué au premier scan puis réutilisé : celui
+        # interne à la base ne supporte pas deux scans concurrents (ScratchInUseError)
+        self._hs_local = threading.local()
+        # Jumeaux bytes des motifs, équivalents aux motifs str sur un texte ASCII
+        self._compiled_bytes = [re.compile(_bytes_expression(pattern.pattern, keep_boundaries=True))
+                                for pattern in self._compiled]
+        self._rule_prefixes = [_literal_prefix(pattern.pattern) for pattern in self._compiled]
+        self._fallback_prefixes_bytes = [self._rule_prefixes[rule].encode() for rule in self._fallback_rules]
+        self._line_gates: Dict[Tuple[int, ...], Pattern] = {}
     
     def _load_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Load regex patterns for secret detection"""
@@ -150,120 +390,404 @@ class RegexScanner:
             }
         }
     
-    def scan_file(self, file_path: str) -> List[Dict[str, Any]]:
+    def _compile_hyperscan(self) -> Tuple[Optional[Any], Optional[Any], List[int]]:
+        """Compile the rules Hyperscan supports into its two databases.
+
+        Returns the database for pure ASCII buffers, the one for decoded text
+        (both None without the engine) and the indexes of the rules left to
+        the per-line `re` loop.
+        """
+        if hyperscan is None:
+            return None, None, list(range(len(self._rule_ids)))
+
+        sources = {
+            rule: self._compiled[rule].pattern
+            for rule, rule_id in enumerate(self._rule_ids)
+            if rule_id not in self.HS_INCOMPATIBLE
+        }
+        try:
+            return self._hyperscan_databases(sources) + (self._missing_rules(sources),)
+        except hyperscan.error:
+            pass
+
+        # Liste pas à jour : les règles refusées sont isolées une fois, au démarrage
+        rejected = [rule for rule in sources if not self._hyperscan_accepts(sources[rule])]
+        print(f"Hyperscan cannot compile {', '.join(self._rule_ids[rule] for rule in rejected)}, "
+              f"scanning them with re")
+        for rule in rejected:
+            del sources[rule]
+        try:
+            return self._hyperscan_databases(sources) + (self._missing_rules(sources),)
+        except hyperscan.error as e:
+            print(f"Hyperscan compile failed, falling back to re: {e}")
+            return None, None, list(range(len(self._rule_ids)))
+
+    def _missing_rules(self, sources: Dict[int, str]) -> List[int]:
+        return [rule for rule in range(len(self._rule_ids)) if rule not in sources]
+
+    @staticmethod
+    def _hyperscan_databases(sources: Dict[int, str]) -> Tuple[Optional[Any], Optional[Any]]:
+        if not sources:
+            return None, None
+        # Base ASCII : `\b` conservé, un long run base64 ne lève qu'un événement et
+        # non un par position ; elle porte aussi le témoin des octets non ASCII
+        ascii_db = hyperscan.Database()
+        ascii_db.compile(
+            expressions=[_bytes_expression(source, keep_boundaries=True) for source in sources.values()]
+                        + [HS_UNCLEAN_EXPRESSION],
+            ids=list(sources) + [HS_UNCLEAN_ID],
+            flags=[0] * len(sources) + [hyperscan.HS_FLAG_SINGLEMATCH],
+        )
+        text_db = hyperscan.Database()
+        text_db.compile(
+            expressions=[_bytes_expression(source) for source in sources.values()],
+            ids=list(sources),
+            flags=0,
+        )
+        return ascii_db, text_db
+
+    @staticmethod
+    def _hyperscan_accepts(source: str) -> bool:
+        try:
+            for keep_boundaries in (True, False):
+                hyperscan.Database().compile(
+                    expressions=[_bytes_expression(source, keep_boundaries)], ids=[0], flags=0
+                )
+        except hyperscan.error:
+            return False
+        return True
+
+    def _hyperscan_scratch(self, db) -> Any:
+        """Scratch space of the calling thread for the given database"""
+        scratches = getattr(self._hs_local, "scratches", None)
+        if scratches is None:
+            # Un scratch par base : ceux de cette version du binding ne se réallouent pas
+            scratches = self._hs_local.scratches = {
+                id(self._hs_db): hyperscan.Scratch(self._hs_db),
+                id(self._hs_text_db): hyperscan.Scratch(self._hs_text_db),
+            }
+        return scratches[id(db)]
+
+    def _hyperscan_scan(self, db, data) -> Tuple[List[Tuple[int, int]], bool]:
+        """(rule index, end offset) hits in the buffer, and whether it is plain ASCII without '\\r'"""
+        ends: List[Tuple[int, int]] = []
+        db.scan(data, match_event_handler=lambda rule, start, end, flags, ctx: ends.append((rule, end)),
+                scratch=self._hyperscan_scratch(db))
+        hits = [hit for hit in ends if hit[0] != HS_UNCLEAN_ID]
+        return hits, len(hits) == len(ends)
+
+    def _hyperscan_prefilter(self, data) -> Tuple[Optional[str], List[Tuple[int, int]]]:
+        """Decoded text plus the (rule index, line index) pairs where Hyperscan saw a possible match.
+
+        The text is None when no rule can match the file, which is then never decoded.
+        """
+        hits, clean = self._hyperscan_scan(self._hs_db, data)
+        if clean:
+            if not hits and not any(data.find(prefix) != -1 for prefix in self._fallback_prefixes_bytes):
+                return None, []
+            return _decode_text(data[:]), self._hyperscan_lines(data, hits)
+
+        # Octets non ASCII ou '\r' : les offsets ne valent que sur le texte décodé, réencodé
+        content = _decode_text(data[:])
+        encoded = content.encode('utf-8')
+        # Fichier ASCII en CRLF : le texte décodé reste ASCII, la base exacte suffit
+        db = self._hs_db if content.isascii() else self._hs_text_db
+        hits, _ = self._hyperscan_scan(db, encoded)
+        return content, self._hyperscan_lines(encoded, hits)
+
+    @staticmethod
+    def _hyperscan_lines(data, hits: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        if not hits:
+            return []
+        newlines = _newline_offsets(data)
+        lines: Set[Tuple[int, int]] = {(rule, bisect_left(newlines, end - 1)) for rule, end in hits}
+        # Même ordre que la boucle règle par règle puis ligne par ligne
+        return sorted(lines)
+
+    def _line_gate(self, rules: Tuple[int, ...]) -> Pattern:
+        """One alternation over the given rules, compiled once per rule subset"""
+        try:
+            return self._line_gates[rules]
+        except KeyError:
+            pass
+        gate = re.compile("|".join(
+            "(?:" + GATE_OPTIONAL_HEAD_RE.sub("", self._compiled[rule].pattern) + ")"
+            for rule in rules
+        ))
+        self._line_gates[rules] = gate
+        return gate
+
+    def _gate_lines(self, content: str, gate: Pattern) -> List[int]:
+        """Indexes of the lines where at least one of the gated rules can match"""
+        lines: List[int] = []
+        line_idx = 0
+        counted = 0
+        match = gate.search(content)
+        while match is not None:
+            line_idx += content.count('\n', counted, match.start())
+            counted = match.start()
+            lines.append(line_idx)
+            # Reprise au début de la ligne suivante et non après le match :
+            # un match sur plusieurs lignes ne doit pas masquer les suivantes
+            line_end = content.find('\n', counted)
+            if line_end == -1:
+                break
+            match = gate.search(content, line_end + 1)
+        return lines
+
+    def scan_file(self, file_path: str) -> List[Finding]:
         """Scan a single file for secrets"""
         findings = []
+        # Offsets (début, fin) de chaque finding dans le texte, pour _drop_overlaps
+        spans: List[Tuple[int, int]] = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                lines = content.split('\n')
-                
-                for rule_id, rule_config in self.patterns.items():
-                    pattern = rule_config["pattern"]
+            # Lecture binaire : avec Hyperscan, un fichier sans aucun candidat n'est
+            # jamais décodé, et au-delà de MMAP_MIN_SIZE il est scanné sans copie.
+            # Descripteur brut plutôt qu'open() : pas d'objet fichier bufferisé ni
+            # d'isatty/fstat/lseek supplémentaires pour chacun des petits fichiers
+            fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                size = os.fstat(fd).st_size
+                if size > self.max_size:
+                    return findings
+                if self._hs_db is not None and size >= MMAP_MIN_SIZE:
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                        if self._looks_binary(mm):
+                            return findings
+                        content, hs_lines = self._hyperscan_prefilter(mm)
+                else:
+                    data = _read_fd(fd, size)
+                    if self._looks_binary(data):
+                        return findings
+                    if self._hs_db is None:
+                        content, hs_lines = _decode_text(data), []
+                    else:
+                        content, hs_lines = self._hyperscan_prefilter(data)
+            finally:
+                os.close(fd)
+            if content is None:
+                return findings
+
+            # Règles hors base Hyperscan : celles dont le préfixe littéral manque au
+            # fichier sont écartées d'office, une passe de l'alternation des autres
+            # sur tout le fichier, puis chaque règle sur les seules lignes retenues
+            survivors = tuple(rule for rule in self._fallback_rules if self._rule_prefixes[rule] in content)
+            gated = self._gate_lines(content, self._line_gate(survivors)) if survivors else []
+            candidates = ((rule, line_idx) for rule in survivors for line_idx in gated)
+            if self._hs_db is not None:
+                candidates = merge(hs_lines, candidates)
+
+            # Texte ASCII, le cas courant : les jumeaux bytes des motifs donnent les mêmes
+            # matches sans passer par les tables Unicode de sre pour `\b` et les classes.
+            # L'alternation reste en str, plus rapide ainsi sans `\b` de tête
+            ascii_text = content.isascii()
+            if ascii_text:
+                text, compiled = content.encode('ascii'), self._compiled_bytes
+            else:
+                text, compiled = content, self._compiled
+
+            # Pas de split : les bornes de ligne ne sont calculées qu'au premier candidat
+            newlines: Optional[List[int]] = None
+            for rule, line_idx in candidates:
+                if newlines is None:
+                    newlines = _newline_offsets(text)
+                rule_id = self._rule_ids[rule]
+                line_start = newlines[line_idx - 1] + 1 if line_idx else 0
+                line_end = newlines[line_idx] if line_idx < len(newlines) else len(text)
+
+                for match in compiled[rule].finditer(text, line_start, line_end):
+                    secret = match.group()
+                    if ascii_text:
+                        secret = secret.decode('ascii')
+                    # Skip obvious false positives
+                    if self._is_false_positive(secret, rule_id):
+                        continue
                     
-                    for line_no, line in enumerate(lines, 1):
-                        matches = pattern.finditer(line)
-                        
-                        for match in matches:
-                            # Skip obvious false positives
-                            if self._is_false_positive(match.group(), rule_id):
-                                continue
-                            
-                            finding = {
-                                "file": file_path,
-                                "line": line_no,
-                                "column": match.start() + 1,
-                                "type": rule_id,
-                                "secret": match.group(),
-                                "severity": rule_config["severity"],
-                                "description": rule_config["description"],
-                                "scanner": "regex"
-                            }
-                            findings.append(finding)
+                    finding = Finding(
+                        file_path,
+                        line_idx + 1,
+                        match.start() - line_start + 1,
+                        rule_id,
+                        secret,
+                        self._severities[rule],
+                        self._descriptions[rule],
+                        "regex",
+                    )
+                    findings.append(finding)
+                    spans.append(match.span())
+                    if self.fail_fast and finding.severity == "critical":
+                        return self._drop_overlaps(findings, spans)
         
         except Exception as e:
             print(f"Error scanning file {file_path}: {e}")
         
-        return findings
+        return self._drop_overlaps(findings, spans)
+
+    @staticmethod
+    def _drop_overlaps(findings: List[Finding], spans: List[Tuple[int, int]]) -> List[Finding]:
+        """Keep only the most severe of overlapping findings, in their original order"""
+        if len(findings) < 2:
+            return findings
+        ranks = [SEVERITY_RANK.get(finding.severity, 0) for finding in findings]
+        order = sorted(range(len(findings)), key=lambda i: (spans[i][0], -ranks[i]))
+
+        # Les gardés ne se chevauchent jamais entre eux : seul le dernier (celui
+        # qui finit le plus loin) peut recouvrir le match courant
+        kept: List[int] = []
+        for i in order:
+            if kept and spans[i][0] < spans[kept[-1]][1]:
+                if ranks[i] > ranks[kept[-1]]:
+                    kept[-1] = i
+                continue
+            kept.append(i)
+
+        if len(kept) == len(findings):
+            return findings
+        kept.sort()
+        return [findings[i] for i in kept]
     
-    def scan_directory(self, directory: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _looks_binary(data) -> bool:
+        """Sniff the head of the buffer already read (or mapped) for NULs or control bytes"""
+        if data.find(b'\x00', 0, BINARY_SNIFF_SIZE) != -1:
+            return True
+        head = data[:BINARY_CONTROL_SNIFF_SIZE]
+        return len(head.translate(None, TEXT_BYTES)) > len(head) * BINARY_CONTROL_RATIO
+
+    def scan_directory(self, directory: str) -> List[Finding]:
         """Scan directory recursively"""
         findings = []
-        
-        for root, dirs, files in os.walk(directory):
-            # Skip common directories that shouldn't be scanned
-            dirs[:] = [d for d in dirs if not self._should_skip_directory(d)]
-            
-            for file in files:
-                if self._should_scan_file(file):
-                    file_path = os.path.join(root, file)
-                    file_findings = self.scan_file(file_path)
-                    findings.extend(file_findings)
-        
+        for file_findings in self._scan_files(self._iter_files(directory)):
+            findings.extend(file_findings)
+            if self.fail_fast and any(finding.severity == "critical" for finding in file_findings):
+                break
         return findings
+
+    def _iter_files(self, directory: str) -> Iterator[str]:
+        """Yield the paths to scan in os.walk order, reusing scandir's cached entry types"""
+        stack = [directory]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    if self._should_scan_file(entry.name):
+                        yield entry.path
+                # Comme os.walk : un lien vers un dossier n'est pas suivi
+                elif not entry.is_symlink() and not self._should_skip_directory(entry.name):
+                    subdirs.append(entry.path)
+            stack.extend(reversed(subdirs))
+
+    def _scan_files(self, paths: Iterator[str]) -> Iterator[List[Finding]]:
+        """Yield per-file findings in walk order, spread over every core when the tree is large"""
+        workers = os.cpu_count() or 1
+        if workers > 1:
+            # Le pool n'est créé que si le parcours dépasse PARALLEL_MIN_FILES fichiers
+            head = list(itertools.islice(paths, PARALLEL_MIN_FILES))
+            if len(head) < PARALLEL_MIN_FILES:
+                for file_path in head:
+                    yield self.scan_file(file_path)
+                return
+
+            try:
+                executor = ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_scan_worker,
+                    initargs=(type(self), self.max_size, self.fail_fast)
+                )
+                first = executor.submit(_scan_file_worker, head[0])
+            except (OSError, NotImplementedError) as e:
+                # Pas de multiprocessing disponible (sandbox, /dev/shm absent...) : scan séquentiel
+                print(f"Parallel scan unavailable ({e}), scanning sequentially")
+                paths = itertools.chain(head, paths)
+            else:
+                # Chaque worker compile ses propres règles une fois, dans _init_scan_worker
+                with executor:
+                    rest = executor.map(_scan_file_worker, itertools.chain(head[1:], paths),
+                                        chunksize=PARALLEL_CHUNK_SIZE)
+                    try:
+                        yield first.result()
+                        yield from rest
+                    finally:
+                        # Arrêt anticipé (fail_fast) : les lots pas encore lancés sont
+                        # annulés, la sortie du with n'attend que ceux en cours
+                        rest.close()
+                return
+
+        for file_path in paths:
+            yield self.scan_file(file_path)
     
     def _should_skip_directory(self, dirname: str) -> bool:
         """Check if directory should be skipped"""
-        skip_dirs = {
-            '.git', 'node_modules', '__pycache__', '.pytest_cache',
-            'vendor', 'dist', 'build', '.venv', 'venv',
-            '.tox', '.coverage', '.mypy_cache'
-        }
-        return dirname in skip_dirs or dirname.startswith('.')
+        return dirname in self.SKIP_DIRS or dirname.startswith('.')
     
     def _should_scan_file(self, filename: str) -> bool:
         """Check if file should be scanned"""
-        # Skip binary file extensions
-        skip_extensions = {
-            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg',
-            '.zip', '.tar', '.gz', '.rar', '.7z',
-            '.exe', '.dll', '.so', '.dylib',
-            '.pdf', '.doc', '.docx', '.xls', '.xlsx',
-            '.mp3', '.mp4', '.avi', '.mov', '.wav',
-            '.pyc', '.pyo', '.class', '.o', '.obj'
-        }
-        
-        _, ext = os.path.splitext(filename.lower())
-        return ext not in skip_extensions
+        dot = filename.rfind('.')
+        # Comme os.path.splitext : sans point, ou avec seulement des points devant
+        # le dernier ('.bashrc', '..png'), le nom n'a pas d'extension
+        if dot <= 0 or filename.count('.', 0, dot) == dot:
+            return True
+        return filename[dot:].lower() not in self.SKIP_EXTENSIONS
     
     def _is_false_positive(self, match: str, rule_id: str) -> bool:
         """Basic false positive detection"""
         # Skip obvious placeholders and examples
-        false_positive_patterns = [
-            r'^(example|test|demo|placeholder|fake|dummy|sample)',
-            r'^[x]{8,}$',  # All x's
-            r'^[*]{8,}$',  # All asterisks
-            r'^[0]{8,}$',  # All zeros
-            r'^[1]{8,}$',  # All ones
-            r'^(your|my|our)[-_]?(secret|key|token)',
-            r'^\$\{.*\}$',  # Environment variable placeholder
-            r'^<.*>$',      # XML/HTML placeholder
-        ]
-        
-        match_lower = match.lower()
-        for pattern in false_positive_patterns:
-            if re.match(pattern, match_lower):
-                return True
+        if FALSE_POSITIVE_RE.match(match):
+            return True
         
         # Rule-specific false positive detection
         if rule_id == "high_entropy":
             # Skip common base64 padding and short strings
             if len(match) < 20 or match.endswith('=='):
                 return True
+            if _shannon_entropy(match) < HIGH_ENTROPY_MIN_RATIO * math.log2(min(len(match), 64)):
+                return True
         
         return False
 
+
+_worker_scanner: Optional[RegexScanner] = None
+
+
+def _init_scan_worker(scanner_class: type, max_size: int, fail_fast: bool):
+    """Build the per-process scanner, patterns and Hyperscan database included"""
+    global _worker_scanner
+    # Classe de l'appelant : une sous-classe (_load_patterns, HS_INCOMPATIBLE...)
+    # garde ses propres règles, comme en scan séquentiel
+    _worker_scanner = scanner_class(max_size=max_size, fail_fast=fail_fast)
+
+
+def _scan_file_worker(file_path: str) -> List[Finding]:
+    return _worker_scanner.scan_file(file_path)
+
+
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) != 2:
-        print("Usage: python run_regex.py <directory>")
+    args = [arg for arg in sys.argv[1:] if arg != "--fail-fast"]
+    if len(args) != 1:
+        print("Usage: python run_regex.py [--fail-fast] <directory>")
         sys.exit(1)
     
-    scanner = RegexScanner()
-    findings = scanner.scan_directory(sys.argv[1])
+    fail_fast = len(args) != len(sys.argv) - 1
+    scanner = RegexScanner(fail_fast=fail_fast)
+    findings = scanner.scan_directory(args[0])
+    
+    # Une seule écriture : pas d'appel print (verrou + flush) par finding
+    report = [f"Found {len(findings)} potential secrets"]
+    report.extend(f"  {finding.file}:{finding.line} - {finding.type} ({finding.severity})" for finding in findings)
+    sys.stdout.write("\n".join(report) + "\n")
     
-    print(f"Found {len(findings)} potential secrets")
-    for finding in findings:
-        print(f"  {finding['file']}:{finding['line']} - {finding['type']} ({finding['severity']})")
\ No newline at end of file
+    # Code de retour exploitable par un hook pre-commit ou un job CI
+    if fail_fast and any(finding.severity == "critical" for finding in findings):
+        sys.exit(1)
\ No newline at end of file